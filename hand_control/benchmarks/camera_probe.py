@@ -0,0 +1,95 @@
+import sys
+import time
+import argparse
+import cv2
+import numpy as np
+from src.camera_modes import negotiate, fourcc_code, fourcc_name
+
+DEFAULT_MODE = ("YUYV", 640, 480, 30.0)
+
+class MockCapture:
+    # Stands in for cv2.VideoCapture: `formats` maps (fourcc, width, height)
+    # to {fps: decode ms}. Like a V4L2 driver it silently falls back to its
+    # default for formats it does not have and snaps the frame rate to the
+    # nearest one it supports.
+    def __init__(self, formats, opened=True):
+        self.formats = formats
+        self.opened = opened
+        fourcc, width, height, fps = DEFAULT_MODE
+        self.props = {cv2.CAP_PROP_FOURCC: fourcc_code(fourcc), cv2.CAP_PROP_FRAME_WIDTH: width,
+                      cv2.CAP_PROP_FRAME_HEIGHT: height, cv2.CAP_PROP_FPS: fps}
+        self.last_grab = None
+
+    def isOpened(self):
+        return self.opened
+
+    def key(self):
+        return (fourcc_name(self.props[cv2.CAP_PROP_FOURCC]), int(self.props[cv2.CAP_PROP_FRAME_WIDTH]),
+                int(self.props[cv2.CAP_PROP_FRAME_HEIGHT]))
+
+    def set(self, prop, value):
+        self.props[prop] = value
+        if self.key() not in self.formats:
+            fourcc, width, height, _ = DEFAULT_MODE
+            self.props[cv2.CAP_PROP_FOURCC] = fourcc_code(fourcc)
+            self.props[cv2.CAP_PROP_FRAME_WIDTH] = width
+            self.props[cv2.CAP_PROP_FRAME_HEIGHT] = height
+        rates = self.formats.get(self.key(), {DEFAULT_MODE[3]: 1.0})
+        self.props[cv2.CAP_PROP_FPS] = min(rates, key=lambda r: abs(r - self.props[cv2.CAP_PROP_FPS]))
+        return True
+
+    def get(self, prop):
+        return self.props.get(prop, 0)
+
+    def grab(self):
+        interval = 1.0 / self.props[cv2.CAP_PROP_FPS]
+        if self.last_grab is not None:
+            time.sleep(max(0.0, self.last_grab + interval - time.perf_counter()))
+        self.last_grab = time.perf_counter()
+        return True
+
+    def retrieve(self):
+        decode_ms = self.formats.get(self.key(), {}).get(self.props[cv2.CAP_PROP_FPS], 1.0)
+        time.sleep(decode_ms / 1000.0)
+        return True, np.zeros((int(self.props[cv2.CAP_PROP_FRAME_HEIGHT]), int(self.props[cv2.CAP_PROP_FRAME_WIDTH]), 3), np.uint8)
+
+    def release(self):
+        self.opened = False
+
+# name, formats, CPU budget, expected (fourcc, fps) or None. Measured decode
+# time includes sleep overshoot, so each nominal load is kept far from its
+# budget: MJPG@120 at 6% or 48% and MJPG@60 at 9% against 25%.
+SCENARIOS = (
+    ("mjpg-120", {("MJPG", 640, 480): {120: 0.5, 60: 0.5, 30: 0.5}, ("YUYV", 640, 480): {30: 0.3}}, 0.25, ("MJPG", 120)),
+    ("over-budget-120", {("MJPG", 640, 480): {120: 4.0, 60: 1.5, 30: 1.5}, ("YUYV", 640, 480): {30: 0.3}}, 0.25, ("MJPG", 60)),
+    ("nothing-fits", {("MJPG", 640, 480): {60: 9.0}, ("YUYV", 640, 480): {30: 9.0}}, 0.1, ("YUYV", 30)),
+    ("ignores-requests", {("YUYV", 640, 480): {30: 0.3}}, 0.25, ("YUYV", 30)),
+    ("unavailable", None, 0.25, None),
+)
+
+def run_scenario(formats, cpu_budget, frames, verbose):
+    open_capture = (lambda index: MockCapture(formats)) if formats else (lambda index: MockCapture({}, opened=False))
+    log = print if verbose else (lambda message: None)
+    chosen, results = negotiate(0, 640, 480, cpu_budget=cpu_budget, frames=frames, open_capture=open_capture, log=log)
+    if chosen is None:
+        return None, results
+    return (chosen.actual.fourcc, int(round(chosen.actual.fps))), results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check camera mode negotiation against a mocked VideoCapture")
+    parser.add_argument("--frames", type=int, default=12, help="frames timed per candidate mode")
+    parser.add_argument("--verbose", action="store_true", help="print every probed mode")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for name, formats, cpu_budget, expected in SCENARIOS:
+        got, results = run_scenario(formats, cpu_budget, args.frames, args.verbose)
+        ok = got == expected
+        failures += not ok
+        shown = f"{got[0]}@{got[1]}" if got else "none"
+        wanted = f"{expected[0]}@{expected[1]}" if expected else "none"
+        print(f"{name:<18} {len(results):2d} distinct modes -> {shown:<9} (expected {wanted}) {'ok' if ok else 'FAIL'}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+import argparse
+import json
+import numpy as np
+from src.controller import MouseController
+from src.input import RecordingInputBackend
+from src.landmarks import from_array
+from src.session import load_session
+from src.sound import SoundManager
+from benchmarks import fixtures
+
+BUTTON_EVENTS = ("click", "right_click", "mouse_down")
+
+def smoothstep(x):
+    x = min(1.0, max(0.0, x))
+    return x * x * (3 - 2 * x)
+
+def synthetic_session(actions=40, fps=30.0, noise=0.002, seed=0):
+    # Taps on both pinches at different speeds, plus near misses that close
+    # quickly but stop short of the trigger.
+    rng = np.random.default_rng(seed)
+    open_pts = fixtures.hand_points("open")
+    targets = {"left": fixtures.hand_points("left_pinch"), "right": fixtures.hand_points("right_pinch")}
+    frames = []
+    t = 0.0
+    dt = 1.0 / fps
+
+    def emit(pts):
+        nonlocal t
+        jitter = rng.normal(0.0, noise, pts.shape).astype(np.float32)
+        jitter[:, 2] = 0.0
+        frames.append((t, [{"landmarks": from_array(pts + jitter), "label": "Right", "score": 0.95}]))
+        t += dt
+
+    for _ in range(int(0.5 * fps)):
+        emit(open_pts)
+    for _ in range(actions):
+        side = "left" if rng.random() < 0.5 else "right"
+        near_miss = rng.random() < 0.3
+        depth = rng.uniform(0.5, 0.68) if near_miss else 1.0
+        close_time = rng.uniform(0.08, 0.25)
+        hold_time = 0.0 if near_miss else rng.uniform(0.1, 0.25)
+        target = targets[side]
+        for phase, duration in (("close", close_time), ("hold", hold_time), ("open", rng.uniform(0.12, 0.2))):
+            steps = max(1, int(round(duration * fps)))
+            for i in range(steps):
+                x = (i + 1) / steps
+                alpha = depth * (smoothstep(x) if phase == "close" else 1.0 if phase == "hold" else 1.0 - smoothstep(x))
+                emit(open_pts + (target - open_pts) * alpha)
+        for _ in range(int(rng.uniform(0.4, 0.8) * fps)):
+            emit(open_pts)
+    return frames
+
+def glitch_session(glitches=20, fps=30.0, noise=0.002, seed=0):
+    # An open hand with single frames where tracking snaps to a full pinch,
+    # the way a landmark glitch looks. None of them should click.
+    rng = np.random.default_rng(seed)
+    open_pts = fixtures.hand_points("open")
+    frames = []
+    t = 0.0
+
+    def emit(pts):
+        nonlocal t
+        jitter = rng.normal(0.0, noise, pts.shape).astype(np.float32)
+        jitter[:, 2] = 0.0
+        frames.append((t, [{"landmarks": from_array(pts + jitter), "label": "Right", "score": 0.95}]))
+        t += 1.0 / fps
+
+    for _ in range(int(0.5 * fps)):
+        emit(open_pts)
+    for _ in range(glitches):
+        emit(fixtures.hand_points("left_pinch" if rng.random() < 0.5 else "right_pinch"))
+        for _ in range(int(rng.uniform(0.3, 0.6) * fps)):
+            emit(open_pts)
+    return frames
+
+def pinch_onsets(frames):
+    return pinch_edges(frames)[0]
+
+def pinch_edges(frames):
+    # Ground truth: when the raw distance first crosses each trigger and
+    # later its release, using the controller's own hysteresis thresholds.
+    probe = MouseController(input_backend=RecordingInputBackend())
+    onsets = {"left": [], "right": []}
+    releases = {"left": [], "right": []}
+    pinching = {"left": False, "right": False}
+    limits = {
+        "left": (8, probe.pinch_trigger, probe.left_pinch_release),
+        "right": (12, probe.right_pinch_trigger, probe.right_pinch_release),
+    }
+    for t, hands in frames:
+        if not hands:
+            continue
+        landmarks = hands[0]["landmarks"]
+        scale = probe.get_hand_scale(landmarks) or 1.0
+        for side, (tip, trigger, release) in limits.items():
+            dist = probe.get_distance(landmarks.landmark[4], landmarks.landmark[tip]) / scale
+            if not pinching[side] and dist < trigger:
+                pinching[side] = True
+                onsets[side].append(t)
+            elif pinching[side] and dist > release:
+                pinching[side] = False
+                releases[side].append(t)
+    return onsets, releases
+
+def replay(frames, predictive):
+    backend = RecordingInputBackend()
+    mouse = MouseController(input_backend=backend)
+    mouse.is_active = True
+    mouse.is_calibrated = True
+    mouse.predictive_commit = predictive
+    events = []
+    left_commits = []
+    was_committed = False
+    for t, hands in frames:
+        before = len(backend.events)
+        mouse.process(hands, t)
+        for _, action, _ in backend.events[before:]:
+            if action in BUTTON_EVENTS:
+                events.append((t, action))
+        committed = mouse.current_gesture == "left_pinch" and mouse.provisional_gesture is None
+        if committed and not was_committed:
+            left_commits.append(t)
+        was_committed = committed
+    return events, left_commits, dict(mouse.commit_stats)
+
+def latencies(onsets, times, limit=0.5):
+    result = []
+    for onset in onsets:
+        later = [t - onset for t in times if 0 <= t - onset <= limit]
+        if later:
+            result.append(min(later) * 1000.0)
+    return result
+
+def unmatched(events, reference, tolerance=0.3):
+    extra = 0
+    for t, action in events:
+        if not any(a == action and abs(t - r) <= tolerance for r, a in reference):
+            extra += 1
+    return extra
+
+def describe(values):
+    if not values:
+        return {"count": 0, "p50_ms": 0.0, "p95_ms": 0.0}
+    return {"count": len(values), "p50_ms": float(np.percentile(values, 50)), "p95_ms": float(np.percentile(values, 95))}
+
+def evaluate(name, frames):
+    onsets = pinch_onsets(frames)
+    runs = {}
+    for mode, predictive in (("baseline", False), ("predictive", True)):
+        events, left_commits, stats = replay(frames, predictive)
+        right_clicks = [t for t, action in events if action == "right_click"]
+        runs[mode] = {
+            "events": events,
+            "buttons": len(events),
+            "right_click": describe(latencies(onsets["right"], right_clicks)),
+            "left_press": describe(latencies(onsets["left"], left_commits)),
+            "stats": stats,
+        }
+    runs["predictive"]["extra_vs_baseline"] = unmatched(runs["predictive"]["events"], runs["baseline"]["events"])
+    runs["predictive"]["missing_vs_baseline"] = unmatched(runs["baseline"]["events"], runs["predictive"]["events"])
+
+    print(f"\n{name}: {len(frames)} frames, {len(onsets['left'])} left / {len(onsets['right'])} right pinches")
+    print(f"{'mode':<11} {'buttons':>7} {'right p50':>10} {'right p95':>10} {'left p50':>9} {'left p95':>9} {'cancelled':>10}")
+    for mode, run in runs.items():
+        print(f"{mode:<11} {run['buttons']:7d} {run['right_click']['p50_ms']:10.1f} {run['right_click']['p95_ms']:10.1f} "
+              f"{run['left_press']['p50_ms']:9.1f} {run['left_press']['p95_ms']:9.1f} {run['stats']['cancelled']:10d}")
+    print(f"predictive vs baseline: {runs['predictive']['extra_vs_baseline']} extra, "
+          f"{runs['predictive']['missing_vs_baseline']} missing button events")
+    for run in runs.values():
+        del run["events"]
+    return {"session": name, "frames": len(frames), "results": runs}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay landmark sessions with and without predictive pinch commit")
+    parser.add_argument("sessions", nargs="*", help="sessions recorded with main.py --record-session")
+    parser.add_argument("--synthetic", type=int, default=0, metavar="N",
+                        help="also replay a generated session with N pinch/near-miss actions")
+    parser.add_argument("--glitches", type=int, default=20, metavar="N",
+                        help="also replay a session with N single-frame pinch glitches, which must not click (0 to skip)")
+    parser.add_argument("--fps", type=float, default=30.0, help="frame rate of the generated session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="write results as JSON")
+    args = parser.parse_args(argv)
+    if not args.sessions and not args.synthetic:
+        args.synthetic = 40
+
+    SoundManager.configure("null")
+    results = []
+    for path in args.sessions:
+        results.append(evaluate(path, load_session(path)))
+    if args.synthetic:
+        frames = synthetic_session(args.synthetic, args.fps, seed=args.seed)
+        results.append(evaluate(f"synthetic ({args.synthetic} actions @ {args.fps:.0f} fps)", frames))
+    if args.glitches:
+        frames = glitch_session(args.glitches, args.fps, seed=args.seed)
+        results.append(evaluate(f"single-frame glitches ({args.glitches} @ {args.fps:.0f} fps)", frames))
+    SoundManager.shutdown()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
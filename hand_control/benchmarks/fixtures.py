@@ -0,0 +1,88 @@
+import math
+import numpy as np
+from src.landmarks import from_array
+
+FINGERS = ((5, 6, 7, 8), (9, 10, 11, 12), (13, 14, 15, 16), (17, 18, 19, 20))
+MCP_X = (-0.045, -0.015, 0.015, 0.045)
+TIP_X_SPREAD = (-0.09, -0.03, 0.03, 0.09)
+TIP_X_TOGETHER = (-0.03, -0.01, 0.01, 0.03)
+
+# thumb extended, fingers extended (index..pinky), fingers together
+POSES = {
+    "open": (True, (True, True, True, True), False),
+    "scroll": (True, (True, True, True, True), True),
+    "fist": (False, (False, False, False, False), False),
+    "middle_click": (False, (True, True, False, False), False),
+    "left_pinch": (True, (True, True, True, True), False),
+    "right_pinch": (True, (True, True, True, True), False),
+    "ring_pinch": (True, (True, True, True, True), False),
+    "pinky_pinch": (True, (True, True, True, True), False),
+}
+
+PINCH_TARGET = {"left_pinch": 8, "right_pinch": 12, "ring_pinch": 16, "pinky_pinch": 20}
+
+def hand_points(pose="open", cx=0.5, cy=0.6, size=1.0, mirror=False):
+    thumb_extended, extended, together = POSES[pose]
+    tip_x = TIP_X_TOGETHER if together else TIP_X_SPREAD
+    pts = np.zeros((21, 3), dtype=np.float32)
+    pts[0, :2] = (0.0, 0.10)
+
+    for i, (mcp, pip, dip, tip) in enumerate(FINGERS):
+        base = np.array([MCP_X[i], -0.05])
+        pts[mcp, :2] = base
+        if extended[i]:
+            dx = tip_x[i] - MCP_X[i]
+            pts[pip, :2] = base + (dx * 0.45, -0.05)
+            pts[dip, :2] = base + (dx * 0.75, -0.08)
+            pts[tip, :2] = base + (dx, -0.11)
+        else:
+            pts[pip, :2] = base + (0.0, -0.04)
+            pts[dip, :2] = base + (0.0, -0.02)
+            pts[tip, :2] = base + (0.0, 0.005)
+
+    pts[1, :2] = (-0.05, 0.06)
+    pts[2, :2] = (-0.075, 0.02)
+    pts[3, :2] = (-0.095, -0.005)
+    pts[4, :2] = (-0.115, -0.03) if thumb_extended else (-0.055, 0.01)
+
+    if pose in PINCH_TARGET:
+        pts[4, :2] = pts[PINCH_TARGET[pose], :2] + (-0.005, 0.005)
+
+    if mirror:
+        pts[:, 0] *= -1
+    pts[:, :2] *= size
+    pts[:, 0] += cx
+    pts[:, 1] += cy
+    return pts
+
+def hand(pose="open", label="Right", **kwargs):
+    return {"landmarks": from_array(hand_points(pose, mirror=(label == "Left"), **kwargs)), "label": label}
+
+def running_sequence(frames=120):
+    poses = ("open", "open", "left_pinch", "left_pinch", "open", "right_pinch", "open",
+             "scroll", "scroll", "open", "fist", "open", "middle_click", "open")
+    sequence = []
+    for i in range(frames):
+        angle = i * 2 * math.pi / frames
+        cx = 0.5 + 0.15 * math.cos(angle)
+        cy = 0.55 + 0.1 * math.sin(angle)
+        pose = poses[(i // 6) % len(poses)]
+        sequence.append([hand(pose, cx=cx, cy=cy)])
+    return sequence
+
+def unlock_frames():
+    # Ring pinch on one hand while the wrists are crossed.
+    return [hand("ring_pinch", "Left", cx=0.6, cy=0.6), hand("open", "Right", cx=0.4, cy=0.6)]
+
+def standby_sequence(frames=60):
+    return [[hand("open", "Left", cx=0.3), hand("open", "Right", cx=0.7)] for _ in range(frames)]
+
+def fixture_frame(width=640, height=480, pose="open"):
+    import cv2
+    frame = np.full((height, width, 3), 90, dtype=np.uint8)
+    pts = hand_points(pose)
+    for a, b in ((0, 1), (1, 2), (2, 3), (3, 4)) + tuple((f[i], f[i + 1]) for f in FINGERS for i in range(3)) + tuple((0, f[0]) for f in FINGERS):
+        pa = (int(pts[a, 0] * width), int(pts[a, 1] * height))
+        pb = (int(pts[b, 0] * width), int(pts[b, 1] * height))
+        cv2.line(frame, pa, pb, (150, 180, 220), 14)
+    return frame
@@ -0,0 +1,95 @@
+import argparse
+import json
+import time
+import numpy as np
+from src.source import open_source
+from src.vision import VisionTracker, HybridTracker
+
+def hand_points(hands_data):
+    return {
+        hand["label"]: np.array([(lm.x, lm.y) for lm in hand["landmarks"].landmark], dtype=np.float32)
+        for hand in hands_data
+    }
+
+def run_tracker(tracker, clip, max_frames):
+    source = open_source(clip, realtime=False)
+    outputs = []
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    while len(outputs) < max_frames or not max_frames:
+        frame = source.read_frame()
+        if frame is None:
+            break
+        outputs.append(hand_points(tracker.process(frame.image)))
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    source.release()
+    tracker.close()
+    return outputs, wall, cpu
+
+def landmark_error(reference, outputs, width):
+    errors = []
+    missed = 0
+    for ref, out in zip(reference, outputs):
+        for label, points in ref.items():
+            if label not in out:
+                missed += 1
+                continue
+            errors.append(np.linalg.norm(out[label] - points, axis=1).mean() * width)
+    return errors, missed
+
+def summarize(name, outputs, wall, cpu, errors=None, missed=0, extra=None):
+    frames = len(outputs)
+    result = {
+        "name": name,
+        "frames": frames,
+        "fps": frames / wall if wall > 0 else 0.0,
+        "cpu_ms_per_frame": cpu * 1000.0 / max(1, frames),
+        "cpu_utilisation": cpu / wall if wall > 0 else 0.0,
+    }
+    if errors is not None:
+        result["error_px_mean"] = float(np.mean(errors)) if errors else 0.0
+        result["error_px_p95"] = float(np.percentile(errors, 95)) if errors else 0.0
+        result["missed_hands"] = missed
+    if extra:
+        result.update(extra)
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare optical-flow propagation against full MediaPipe inference")
+    parser.add_argument("clips", nargs="+", help="recorded clips (video files or image folders)")
+    parser.add_argument("--max-interval", type=int, nargs="+", default=[2, 3, 4, 6])
+    parser.add_argument("--max-frames", type=int, default=0)
+    parser.add_argument("--output", default=None, help="write results as JSON")
+    args = parser.parse_args(argv)
+
+    results = []
+    for clip in args.clips:
+        probe = open_source(clip, realtime=False)
+        first = probe.read_frame()
+        probe.release()
+        width = first.image.shape[1] if first is not None else 1
+
+        reference, wall, cpu = run_tracker(VisionTracker(), clip, args.max_frames)
+        rows = [summarize("full", reference, wall, cpu)]
+        for interval in args.max_interval:
+            tracker = HybridTracker(max_interval=interval)
+            outputs, wall, cpu = run_tracker(tracker, clip, args.max_frames)
+            errors, missed = landmark_error(reference, outputs, width)
+            rows.append(summarize(f"flow<= {interval}", outputs, wall, cpu, errors, missed,
+                                  {"inference_ratio": tracker.stats["inference"] / max(1, len(outputs))}))
+
+        print(f"\n{clip}")
+        print(f"{'tracker':<10} {'fps':>7} {'cpu ms':>8} {'cpu %':>6} {'err px':>7} {'p95 px':>7} {'infer %':>8}")
+        for row in rows:
+            print(f"{row['name']:<10} {row['fps']:7.1f} {row['cpu_ms_per_frame']:8.2f} {row['cpu_utilisation'] * 100:6.0f} "
+                  f"{row.get('error_px_mean', 0.0):7.2f} {row.get('error_px_p95', 0.0):7.2f} "
+                  f"{row.get('inference_ratio', 1.0) * 100:8.0f}")
+        results.append({"clip": clip, "results": rows})
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import os
+import json
+import math
+import shutil
+import argparse
+import tempfile
+import numpy as np
+import main as app
+from src.input import RecordingInputBackend
+from src.landmarks import from_array, to_array
+from src.session import SessionSource, load_session
+from src.station import StationProfile
+from benchmarks import fixtures
+from benchmarks.click_latency import synthetic_session, pinch_edges, describe
+
+DEFAULT_ROI = {"x1": 0.25, "y1": 0.3, "x2": 0.75, "y2": 0.9}
+DEFAULT_VARIANTS = ("default=", "no-predict=--no-predict")
+
+def unlock_prefix(fps, seconds=2.0):
+    # Ring pinch with crossed wrists until the controller activates, then a
+    # short pause with no hands so the session starts from a clean state.
+    frames = []
+    for i in range(int(seconds * fps)):
+        frames.append((i / fps, fixtures.unlock_frames()))
+    for i in range(int(0.3 * fps)):
+        frames.append((len(frames) / fps, []))
+    return frames
+
+def with_prefix(prefix, frames, fps):
+    start = prefix[-1][0] + 1.0 / fps if prefix else 0.0
+    t0 = frames[0][0]
+    return prefix + [(start + t - t0, hands) for t, hands in frames]
+
+def add_wander(frames, amplitude=(0.12, 0.08)):
+    # The generated click session holds the hand still; slide it around so
+    # there is cursor motion to time, but hold still around each pinch the
+    # way a user aims a click, otherwise every tap turns into a drag.
+    onsets, releases = pinch_edges(frames)
+    holds = [(on - 0.3, off + 0.2) for side in onsets for on, off in zip(onsets[side], releases[side])]
+    moved = []
+    phase = 0.0
+    prev_t = frames[0][0]
+    for t, hands in frames:
+        if not any(start <= t <= end for start, end in holds):
+            phase += t - prev_t
+        prev_t = t
+        dx = amplitude[0] * math.sin(phase * 0.9)
+        dy = amplitude[1] * math.sin(phase * 1.7)
+        shifted = []
+        for hand in hands:
+            pts = to_array(hand["landmarks"])
+            pts[:, 0] += dx
+            pts[:, 1] += dy
+            shifted.append(dict(hand, landmarks=from_array(pts)))
+        moved.append((t, shifted))
+    return moved
+
+class FrameTaggedBackend(RecordingInputBackend):
+    # The loop is synchronous, so whatever frame the source emitted last is
+    # the one whose processing produced this event.
+    def __init__(self, source):
+        super().__init__()
+        self.source = source
+        self.capture_times = []
+
+    def record(self, action, *args):
+        super().record(action, *args)
+        self.capture_times.append(self.source.current_timestamp)
+
+def write_profile(path, source_profile=None):
+    if source_profile:
+        shutil.copyfile(source_profile, path)
+        return
+    profile = StationProfile(path)
+    profile.controller = {"roi": dict(DEFAULT_ROI)}
+    profile.save()
+
+def parse_variant(spec):
+    name, _, extra = spec.partition("=")
+    return name, extra.split()
+
+def run_variant(script, fps, inference_ms, extra_args, workdir, source_profile=None):
+    profile_path = os.path.join(workdir, "profile.json")
+    write_profile(profile_path, source_profile)
+
+    source = SessionSource(script, fps=fps, realtime=True)
+    backend = FrameTaggedBackend(source)
+    argv = ["--headless", "--audio", "null", "--profile", profile_path,
+            "--replay-inference-ms", str(inference_ms)] + list(extra_args)
+    app.main(argv, source=source, input_backend=backend)
+
+    move_latency = [(t - captured) * 1000.0
+                    for (t, action, _), captured in zip(backend.events, backend.capture_times) if action == "move_to"]
+
+    # Ground truth comes from the script, mapped onto the source clock, so
+    # frames the loop dropped count against the pipeline.
+    offset = source.start_time - script[0][0]
+    onsets, releases = pinch_edges(script)
+    right = match_events(onsets["right"], offset, backend.events, "right_click")
+    left = match_events(releases["left"], offset, backend.events, "click")
+
+    elapsed = source.current_timestamp - source.start_time if source.seq > 1 else 0.0
+    return {
+        "frames": source.seq,
+        "dropped": source.position - source.seq,
+        "fps": (source.seq - 1) / elapsed if elapsed > 0 else 0.0,
+        "capture_to_move": describe_ms(move_latency),
+        "right_onset_to_click": dict(describe_ms(right["latency"]), missed=right["missed"]),
+        "left_release_to_click": dict(describe_ms(left["latency"]), missed=left["missed"]),
+    }
+
+def match_events(script_times, offset, events, action, window=0.5):
+    times = [t for t, name, _ in events if name == action]
+    latency, missed = [], 0
+    for script_time in script_times:
+        onset = script_time + offset
+        later = [t - onset for t in times if 0 <= t - onset <= window]
+        if later:
+            latency.append(min(later) * 1000.0)
+        else:
+            missed += 1
+    return {"latency": latency, "missed": missed}
+
+def describe_ms(values):
+    result = describe(values)
+    result["p99_ms"] = float(np.percentile(values, 99)) if values else 0.0
+    result["max_ms"] = float(max(values)) if values else 0.0
+    return result
+
+def report(name, results):
+    print(f"\n{name}")
+    print(f"{'variant':<14} {'fps':>5} {'drop':>5} {'move p50':>9} {'p95':>7} {'p99':>7} "
+          f"{'right p50':>10} {'p95':>7} {'miss':>5} {'left p50':>9} {'p95':>7} {'miss':>5}")
+    for variant, r in results.items():
+        move, right, left = r["capture_to_move"], r["right_onset_to_click"], r["left_release_to_click"]
+        print(f"{variant:<14} {r['fps']:5.1f} {r['dropped']:5d} {move['p50_ms']:9.1f} {move['p95_ms']:7.1f} {move['p99_ms']:7.1f} "
+              f"{right['p50_ms']:10.1f} {right['p95_ms']:7.1f} {right['missed']:5d} "
+              f"{left['p50_ms']:9.1f} {left['p95_ms']:7.1f} {left['missed']:5d}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure capture-to-input latency through the full main.py loop")
+    parser.add_argument("sessions", nargs="*", help="landmark sessions recorded with main.py --record-session")
+    parser.add_argument("--synthetic", type=int, default=0, metavar="N",
+                        help="also run a generated session with N pinch/near-miss actions (default when no sessions are given)")
+    parser.add_argument("--fps", type=float, default=30.0, help="frame rate of the replayed source")
+    parser.add_argument("--inference-ms", type=float, default=15.0, help="modelled hand inference cost per frame")
+    parser.add_argument("--variant", action="append", default=None, metavar="NAME=ARGS",
+                        help="main.py flags to compare, e.g. 'gate-off=--motion-gate 0' (repeatable)")
+    parser.add_argument("--profile", default=None, help="station profile to copy for thresholds and ROI")
+    parser.add_argument("--no-unlock", action="store_true", help="sessions already contain the unlock gesture")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="write results as JSON")
+    args = parser.parse_args(argv)
+    if not args.sessions and not args.synthetic:
+        args.synthetic = 20
+
+    scripts = [(path, load_session(path)) for path in args.sessions]
+    if args.synthetic:
+        frames = add_wander(synthetic_session(args.synthetic, args.fps, seed=args.seed))
+        scripts.append((f"synthetic ({args.synthetic} actions @ {args.fps:.0f} fps)", frames))
+
+    variants = [parse_variant(spec) for spec in (args.variant or DEFAULT_VARIANTS)]
+    summary = []
+    for name, frames in scripts:
+        script = frames if args.no_unlock else with_prefix(unlock_prefix(args.fps), frames, args.fps)
+        results = {}
+        for variant, extra in variants:
+            workdir = tempfile.mkdtemp(prefix="latency-rig-")
+            try:
+                results[variant] = run_variant(script, args.fps, args.inference_ms, extra, workdir, args.profile)
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+        report(f"{name}: {args.inference_ms:.0f} ms modelled inference", results)
+        summary.append({"session": name, "inference_ms": args.inference_ms, "results": results})
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import numpy as np
+import cv2
+
+from src.filter import OneEuroFilter
+from src.controller import MouseController
+from src.input import NullInputBackend
+from src.sound import SoundManager
+from src.ui import HUD
+from src.results import SystemState, DebugInfo, CalibrationResult, RunningResult
+from benchmarks import fixtures
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+def make_controller(active=True, calibrated=True):
+    mouse = MouseController(input_backend=NullInputBackend())
+    mouse.is_active = active
+    mouse.is_calibrated = calibrated
+    return mouse
+
+def cycle(items):
+    state = {"i": 0}
+    def next_item():
+        i = state["i"]
+        state["i"] = (i + 1) % len(items)
+        return items[i]
+    return next_item
+
+@benchmark("filter.one_euro")
+def bench_one_euro():
+    f = OneEuroFilter(min_cutoff=0.01, beta=0.05)
+    state = {"t": 0.0}
+    def run():
+        state["t"] += 1 / 30
+        f(500.0 + state["t"], t=state["t"])
+    return run
+
+@benchmark("controller.get_finger_states")
+def bench_finger_states():
+    mouse = make_controller()
+    landmarks = fixtures.hand("open")["landmarks"]
+    return lambda: mouse.get_finger_states(landmarks)
+
+@benchmark("controller.detect_gesture_priority")
+def bench_detect_gesture():
+    mouse = make_controller()
+    next_hands = cycle(fixtures.running_sequence())
+    return lambda: mouse.detect_gesture_priority(next_hands()[0]["landmarks"])
+
+@benchmark("controller.map_coordinates")
+def bench_map_coordinates():
+    mouse = make_controller()
+    hands = fixtures.running_sequence()
+    positions = cycle([mouse.get_stable_hand_pos(h[0]["landmarks"]) for h in hands])
+    state = {"t": 0.0}
+    def run():
+        state["t"] += 1 / 30
+        mouse.map_coordinates(positions(), state["t"])
+    return run
+
+@benchmark("controller.process.running")
+def bench_process_running():
+    mouse = make_controller()
+    next_hands = cycle(fixtures.running_sequence())
+    return lambda: mouse.process(next_hands())
+
+@benchmark("controller.process.calibration")
+def bench_process_calibration():
+    mouse = make_controller(calibrated=False)
+    next_hands = cycle(fixtures.running_sequence())
+    return lambda: mouse.process(next_hands())
+
+@benchmark("controller.process.standby")
+def bench_process_standby():
+    mouse = make_controller(active=False, calibrated=False)
+    next_hands = cycle(fixtures.standby_sequence())
+    return lambda: mouse.process(next_hands())
+
+def hud_frame():
+    return np.full((480, 640, 3), 90, dtype=np.uint8)
+
+def system_state(is_active, progress, msg):
+    state = SystemState()
+    state.is_active, state.state_progress, state.state_msg = is_active, progress, msg
+    return state
+
+def debug_info():
+    debug = DebugInfo(lambda landmarks: [True] * 5)
+    debug.update(0.4, 0.5, 0.28, None)
+    return debug
+
+@benchmark("hud.draw_standby.phase0")
+def bench_draw_standby_idle():
+    hud, frame = HUD(), hud_frame()
+    info = system_state(False, 0.0, "PINCH RING")
+    return lambda: hud.draw_standby(frame, info)
+
+@benchmark("hud.draw_standby.phase2")
+def bench_draw_standby_opening():
+    hud, frame = HUD(), hud_frame()
+    info = system_state(False, 0.6, "OPENING...")
+    return lambda: hud.draw_standby(frame, info)
+
+@benchmark("hud.draw_agamotto_eye")
+def bench_draw_eye():
+    hud, frame = HUD(), hud_frame()
+    return lambda: hud.draw_agamotto_eye(frame, (320, 240), 100, 0.6, phase=2)
+
+@benchmark("hud.draw_calibration")
+def bench_draw_calibration():
+    hud, frame = HUD(), hud_frame()
+    data = CalibrationResult(system_state(True, 0.0, ""), debug_info())
+    data.msg, data.progress, data.hand_pos = "CALIBRATION SUCCESS | PROCEED TO POINT 3", 0.4, (0.5, 0.5)
+    data.step, data.points = 2, [(0.2, 0.2), (0.8, 0.25)]
+    data.roi_preview = {"x1": 0.2, "y1": 0.2, "x2": 0.8, "y2": 0.25}
+    return lambda: hud.draw_calibration(frame, data)
+
+@benchmark("hud.draw_running")
+def bench_draw_running():
+    hud, frame = HUD(), hud_frame()
+    data = RunningResult(system_state(True, 0.0, ""), debug_info())
+    data.screen_pos, data.hand_pos = (900, 500), (0.5, 0.5)
+    data.roi = {"x1": 0.2, "y1": 0.2, "x2": 0.8, "y2": 0.8}
+    return lambda: hud.draw_running(frame, data, 30.0)
+
+@benchmark("hud.draw_system_overlay")
+def bench_draw_system_overlay():
+    hud, frame = HUD(), hud_frame()
+    info = system_state(True, 0.5, "HOLD TO STOP")
+    return lambda: hud.draw_system_overlay(frame, info)
+
+def swipe_trajectory(frames=12):
+    points = []
+    for i in range(frames):
+        a = i / (frames - 1)
+        x = 0.35 + 0.3 * a * a * (3 - 2 * a)
+        points.append(((x, 0.5), (x, 0.4)))
+    points += [points[-1]] * 4
+    return points
+
+@benchmark("dynamic.update.idle")
+def bench_dynamic_idle():
+    from src.dynamic import DynamicGestureRecognizer
+    recognizer = DynamicGestureRecognizer()
+    state = {"t": 0.0}
+    def run():
+        state["t"] += 1 / 30
+        recognizer.update(state["t"], (0.5, 0.5), (0.5, 0.4), 0.15)
+    return run
+
+@benchmark("dynamic.match.swipe")
+def bench_dynamic_match():
+    from src.dynamic import DynamicGestureRecognizer
+    recognizer = DynamicGestureRecognizer()
+    rows = np.array([(i / 30, h[0], h[1], tip[0], tip[1]) for i, (h, tip) in enumerate(swipe_trajectory())])
+    recognizer.scale = 0.15
+    return lambda: recognizer.match(rows)
+
+@benchmark("autocal.update")
+def bench_autocal_update():
+    from src.autocal import AutoCalibrator
+    calibrator = AutoCalibrator()
+    state = {"i": 0}
+    def run():
+        i = state["i"] = state["i"] + 1
+        calibrator.update(0.5 + 0.2 * math.sin(i * 0.3), 0.5 + 0.15 * math.cos(i * 0.21), i / 30)
+    return run
+
+@benchmark("motion.gate.static")
+def bench_motion_gate_static():
+    from src.motion import MotionGate
+    gate, frame = MotionGate(max_skip=1 << 30), fixtures.fixture_frame()
+    return lambda: gate.should_process(frame, False)
+
+@benchmark("motion.gate.moving")
+def bench_motion_gate_moving():
+    from src.motion import MotionGate
+    gate = MotionGate()
+    next_frame = cycle([fixtures.fixture_frame(pose=p) for p in ("open", "fist")])
+    return lambda: gate.should_process(next_frame(), False)
+
+@benchmark("vision.process")
+def bench_vision_process(images=None):
+    from src.vision import VisionTracker
+    tracker = VisionTracker()
+    frames = images or [fixtures.fixture_frame(pose=p) for p in ("open", "fist", "left_pinch")]
+    next_frame = cycle(frames)
+    return lambda: tracker.process(next_frame())
+
+def measure(fn, min_batch_time=0.02, repeats=7):
+    fn()
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_batch_time or loops >= 1 << 20:
+            break
+        loops *= 2 if elapsed <= 0 else max(2, min(10, int(min_batch_time / elapsed) + 1))
+
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / loops * 1e6)
+    return {
+        "median_us": statistics.median(samples),
+        "min_us": min(samples),
+        "stdev_us": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "loops": loops,
+        "repeats": repeats,
+    }
+
+def load_images(path):
+    from src.source import ImageFolderSource
+    source = ImageFolderSource(path, realtime=False, preload=True)
+    return [img for img in source.cache if img is not None]
+
+def run_suite(selected=None, images=None, repeats=7):
+    SoundManager.configure("null")
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if selected and not any(s in name for s in selected):
+            continue
+        fn = setup(images) if name == "vision.process" else setup()
+        results[name] = measure(fn, repeats=repeats)
+        print(f"{name:<36} {results[name]['median_us']:>10.2f} us")
+    SoundManager.shutdown()
+    return {
+        "created": time.time(),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+        },
+        "results": results,
+    }
+
+def compare(baseline, current, threshold, selected=None):
+    regressions = []
+    print(f"{'benchmark':<36} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, base in baseline["results"].items():
+        if selected and not any(s in name for s in selected):
+            continue
+        cur = current["results"].get(name)
+        if cur is None:
+            print(f"{name:<36} {base['median_us']:>10.2f} {'missing':>10}")
+            continue
+        change = (cur["median_us"] - base["median_us"]) / base["median_us"] * 100.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<36} {base['median_us']:>10.2f} {cur['median_us']:>10.2f} {change:>+7.1f}%{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Microbenchmarks for the frame-loop hot paths")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="run the suite")
+    run_parser.add_argument("--output", help="save results as a JSON baseline")
+
+    compare_parser = sub.add_parser("compare", help="compare against a baseline and fail on regressions")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("--current", help="previously saved results instead of running the suite now")
+    compare_parser.add_argument("--threshold", type=float, default=15.0, help="allowed slowdown in percent")
+
+    sub.add_parser("list", help="list benchmark names")
+
+    for p in (run_parser, compare_parser):
+        p.add_argument("--filter", nargs="+", help="only run benchmarks whose name contains one of these")
+        p.add_argument("--images", help="fixture image folder for vision.process (default: synthetic hands)")
+        p.add_argument("--repeats", type=int, default=7)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for name in BENCHMARKS:
+            print(name)
+        return 0
+
+    images = load_images(args.images) if args.images else None
+
+    if args.command == "run":
+        results = run_suite(args.filter, images, args.repeats)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if args.current:
+        with open(args.current, "r", encoding="utf-8") as f:
+            current = json.load(f)
+    else:
+        selected = args.filter or list(baseline["results"])
+        current = run_suite(selected, images, args.repeats)
+    regressions = compare(baseline, current, args.threshold, args.filter)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0f}%")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
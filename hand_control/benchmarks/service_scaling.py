@@ -0,0 +1,113 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import multiprocessing
+import numpy as np
+from src.service import RemoteVisionTracker
+from src.source import open_source
+from benchmarks import fixtures
+
+def load_frames(clip):
+    if clip is None:
+        return [fixtures.fixture_frame(pose=p) for p in ("open", "fist", "left_pinch", "scroll")]
+    source = open_source(clip, realtime=False)
+    frames = []
+    while True:
+        frame = source.read_frame()
+        if frame is None:
+            break
+        frames.append(frame.image)
+    source.release()
+    return frames
+
+def run_client(socket_path, clip, duration, start_at, results):
+    frames = load_frames(clip)
+    tracker = RemoteVisionTracker(socket_path)
+    tracker.process(frames[0])
+    tracker.latencies.clear()
+    while time.time() < start_at:
+        time.sleep(0.001)
+    count = 0
+    end = start_at + duration
+    while time.time() < end:
+        tracker.process(frames[count % len(frames)])
+        count += 1
+    latencies = np.array(tracker.latencies) * 1000.0
+    tracker.close()
+    results.put({
+        "frames": count,
+        "fps": count / duration,
+        "latency_ms_p50": float(np.percentile(latencies, 50)) if count else 0.0,
+        "latency_ms_p95": float(np.percentile(latencies, 95)) if count else 0.0,
+    })
+
+def run_round(socket_path, clients, clip, duration):
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    start_at = time.time() + 2.0 + 0.2 * clients
+    procs = [
+        ctx.Process(target=run_client, args=(socket_path, clip, duration, start_at, results))
+        for _ in range(clients)
+    ]
+    for p in procs:
+        p.start()
+    rows = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return {
+        "clients": clients,
+        "throughput_fps": sum(r["fps"] for r in rows),
+        "per_client": rows,
+    }
+
+def wait_for_socket(path, timeout=30.0):
+    deadline = time.time() + timeout
+    while not os.path.exists(path):
+        if time.time() > deadline:
+            raise RuntimeError(f"vision service did not come up at {path}")
+        time.sleep(0.1)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-client latency and total throughput of the vision service as clients are added")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--workers", type=int, default=2, help="workers for the service started by this benchmark")
+    parser.add_argument("--socket", default=None, help="use an already running service instead of starting one")
+    parser.add_argument("--clip", default=None, help="video file or image folder each client replays (default: synthetic hands)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per round")
+    parser.add_argument("--output", default=None, help="write results as JSON")
+    args = parser.parse_args(argv)
+
+    server = None
+    socket_path = args.socket
+    if socket_path is None:
+        socket_path = f"/tmp/agamotto-vision-bench-{os.getpid()}.sock"
+        server = subprocess.Popen([
+            sys.executable, "-m", "src.service", "--socket", socket_path,
+            "--workers", str(args.workers), "--stats-interval", "0",
+        ])
+    try:
+        wait_for_socket(socket_path)
+        rounds = []
+        print(f"{'clients':>7} {'total fps':>10} {'fps/client':>11} {'p50 ms':>8} {'p95 ms':>8} {'worst p95':>10}")
+        for clients in args.clients:
+            result = run_round(socket_path, clients, args.clip, args.duration)
+            rows = result["per_client"]
+            print(f"{clients:7d} {result['throughput_fps']:10.1f} {result['throughput_fps'] / clients:11.1f} "
+                  f"{np.median([r['latency_ms_p50'] for r in rows]):8.1f} "
+                  f"{np.median([r['latency_ms_p95'] for r in rows]):8.1f} "
+                  f"{max(r['latency_ms_p95'] for r in rows):10.1f}")
+            rounds.append(result)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"workers": args.workers, "rounds": rounds}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
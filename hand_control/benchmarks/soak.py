@@ -0,0 +1,52 @@
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import main as app
+from src.session import SessionSource, load_session
+from benchmarks import fixtures
+from benchmarks.click_latency import synthetic_session
+from benchmarks.latency_rig import unlock_prefix, with_prefix, add_wander, write_profile
+
+def lock_suffix(fps, seconds=2.0):
+    # Both palms open until the controller deactivates, then no hands, so
+    # each loop goes through standby, activation and the running gestures.
+    frames = [(i / fps, fixtures.standby_sequence(1)[0]) for i in range(int(seconds * fps))]
+    frames += [(len(frames) / fps, []) for _ in range(int(0.5 * fps))]
+    return frames
+
+def soak_script(actions, fps, seed=0):
+    running = add_wander(synthetic_session(actions, fps, seed=seed))
+    script = with_prefix(unlock_prefix(fps), running, fps)
+    return with_prefix(script, lock_suffix(fps), fps)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the full pipeline on a looping source and flag leaks or frame-time drift")
+    parser.add_argument("session", nargs="?", default=None,
+                        help="landmark session recorded with main.py --record-session (default: generated unlock/click/lock loop)")
+    parser.add_argument("--hours", type=float, default=1.0, help="how long to run")
+    parser.add_argument("--interval", type=float, default=60.0, help="seconds between samples")
+    parser.add_argument("--log", default="soak.jsonl", help="where the samples and findings go")
+    parser.add_argument("--fps", type=float, default=30.0, help="frame rate of the replayed source")
+    parser.add_argument("--actions", type=int, default=12, help="pinch/near-miss actions per generated loop")
+    parser.add_argument("--inference-ms", type=float, default=15.0, help="modelled hand inference cost per frame")
+    parser.add_argument("--profile", default=None, help="station profile to copy for thresholds and ROI")
+    parser.add_argument("--main-args", default="", help="extra main.py flags, e.g. '--dynamic-gestures --clip-buffer 10'")
+    args = parser.parse_args(argv)
+
+    script = load_session(args.session) if args.session else soak_script(args.actions, args.fps)
+    workdir = tempfile.mkdtemp(prefix="soak-")
+    try:
+        profile_path = os.path.join(workdir, "profile.json")
+        write_profile(profile_path, args.profile)
+        source = SessionSource(script, fps=args.fps, realtime=True, loop=True)
+        argv = ["--headless", "--audio", "null", "--input", "null", "--profile", profile_path,
+                "--replay-inference-ms", str(args.inference_ms), "--duration", str(args.hours * 3600),
+                "--soak", args.log, "--soak-interval", str(args.interval)] + args.main_args.split()
+        return app.main(argv, source=source)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import multiprocessing
+import numpy as np
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def cpu_list(cpus):
+    return ",".join(str(c) for c in cpus)
+
+def default_configs(cpus):
+    cpus = sorted(cpus)
+    configs = [("default", []), ("cv-threads-1", ["--cv-threads", "1"]), ("cv-threads-2", ["--cv-threads", "2"])]
+    if len(cpus) < 2:
+        return configs
+    # Keep the loop (and the inference pools it spawns) on its own cores and
+    # push the camera and background threads onto the rest.
+    if len(cpus) >= 4:
+        main_cpus, capture_cpus, background_cpus = cpus[:2], cpus[2:3], cpus[3:]
+    else:
+        main_cpus, capture_cpus, background_cpus = cpus[:-1], cpus[-1:], cpus[-1:]
+    pinned = ["--cv-threads", str(len(main_cpus)), "--pin", f"main={cpu_list(main_cpus)}",
+              "--pin", f"capture={cpu_list(capture_cpus)}", "--pin", f"background={cpu_list(background_cpus)}"]
+    configs.append(("pinned", pinned))
+    configs.append(("pinned+nice", pinned + ["--nice", "background=10"]))
+    return configs
+
+def parse_config(spec):
+    name, _, extra = spec.partition("=")
+    return name, extra.split()
+
+def burn(stop):
+    x = 0
+    while not stop.is_set():
+        for i in range(100000):
+            x += i * i
+
+def run_config(name, extra, args):
+    fd, path = tempfile.mkstemp(prefix="frame-times-", suffix=".jsonl")
+    os.close(fd)
+    command = [sys.executable, "main.py", "--source", args.source, "--headless", "--max-frames", str(args.frames),
+               "--no-profile", "--audio", "null", "--input", "null", "--frame-budget-ms", "0",
+               "--frame-times", path] + extra
+    stop = multiprocessing.Event()
+    load = [multiprocessing.Process(target=burn, args=(stop,), daemon=True) for _ in range(args.load)]
+    for process in load:
+        process.start()
+    try:
+        completed = subprocess.run(command, cwd=APP_DIR, capture_output=True, text=True)
+        with open(path, "r", encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+    finally:
+        stop.set()
+        for process in load:
+            process.join()
+        os.remove(path)
+
+    notes = [line for line in completed.stdout.splitlines() if line.startswith("Thread budget")]
+    if completed.returncode != 0 or not entries:
+        print(f"{name}: main.py failed\n{completed.stderr.strip()}")
+        return None
+    times = np.array([e["frame_ms"] for e in entries[args.warmup:]] or [e["frame_ms"] for e in entries])
+    stages = {}
+    for e in entries[args.warmup:]:
+        for stage, ms in e["stages"].items():
+            stages.setdefault(stage, []).append(ms)
+    return {
+        "config": name,
+        "args": extra,
+        "frames": len(times),
+        "mean_ms": float(times.mean()),
+        "stdev_ms": float(times.std()),
+        "p50_ms": float(np.percentile(times, 50)),
+        "p95_ms": float(np.percentile(times, 95)),
+        "p99_ms": float(np.percentile(times, 99)),
+        "max_ms": float(times.max()),
+        "spikes": int((times > args.spike_ms).sum()),
+        "stage_p95_ms": {stage: float(np.percentile(v, 95)) for stage, v in stages.items()},
+        "notes": notes,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep thread budgets and CPU pinning and compare frame-time variance")
+    parser.add_argument("--source", default="synthetic:640x480@30:bars", help="frame source passed to main.py")
+    parser.add_argument("--frames", type=int, default=300, help="frames per configuration")
+    parser.add_argument("--warmup", type=int, default=30, help="frames left out of the statistics")
+    parser.add_argument("--load", type=int, default=0, metavar="N", help="busy processes competing for CPU during each run")
+    parser.add_argument("--spike-ms", type=float, default=33.0, help="frame time counted as a spike")
+    parser.add_argument("--config", action="append", default=None, metavar="NAME=ARGS",
+                        help="main.py flags to try, e.g. 'pin=--pin main=0-1 --cv-threads 2' (repeatable)")
+    parser.add_argument("--output", default=None, help="write results as JSON")
+    args = parser.parse_args(argv)
+
+    cpus = os.sched_getaffinity(0) if hasattr(os, "sched_getaffinity") else range(os.cpu_count() or 1)
+    configs = [parse_config(spec) for spec in args.config] if args.config else default_configs(cpus)
+    print(f"{len(cpus)} CPUs available, {args.load} competing processes, {args.frames} frames per run")
+
+    results = []
+    for name, extra in configs:
+        result = run_config(name, extra, args)
+        if result is None:
+            continue
+        results.append(result)
+        for note in result["notes"]:
+            print(f"  {name}: {note}")
+
+    print(f"\n{'config':<16} {'mean':>7} {'stdev':>7} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7} {'spikes':>7}")
+    for r in results:
+        print(f"{r['config']:<16} {r['mean_ms']:7.2f} {r['stdev_ms']:7.2f} {r['p50_ms']:7.2f} {r['p95_ms']:7.2f} "
+              f"{r['p99_ms']:7.2f} {r['max_ms']:7.2f} {r['spikes']:7d}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
+import argparse
 import cv2
 import mediapipe as mp
 import time
+from src.telemetry import EventLogger, TRACKING
 
 class HandDetector:
     def __init__(self, mode=False, max_hands=2, detection_con=0.5, track_con=0.5):
@@ -86,6 +88,12 @@ class HandDetector:
             return f"{total_fingers} Fingers"
 
 def main():
+    parser = argparse.ArgumentParser(description="Hand tracking debug viewer")
+    parser.add_argument("--log", default="hand_tracking.jsonl", help="JSON-lines file for landmark events")
+    parser.add_argument("--sample", type=int, default=1, help="keep one tracking event in N")
+    parser.add_argument("--rate", type=float, default=60.0, help="max tracking events per second")
+    args = parser.parse_args()
+
     cap = cv2.VideoCapture(0)
     
     if not cap.isOpened():
@@ -93,6 +101,7 @@ def main():
         return
 
     detector = HandDetector()
+    logger = EventLogger(args.log, sampling={TRACKING: args.sample}, rate_limits={TRACKING: args.rate}).start()
     p_time = 0
 
     print("Starting Hand Tracking... Press 'q' to exit.")
@@ -131,8 +140,8 @@ def main():
                     "Pinky": lm_list[20]
                 }
                 
-                coords_str = ", ".join([f"{k}:({v[1]},{v[2]})" for k, v in key_points.items()])
-                print(f"Hand: {hand_type}, Gesture: {gesture} | {coords_str}")
+                logger.log(TRACKING, "hand", hand=hand_type, gesture=gesture,
+                           points={k: (v[1], v[2]) for k, v in key_points.items()})
 
         c_time = time.time()
         fps = 1 / (c_time - p_time) if (c_time - p_time) > 0 else 0
@@ -145,6 +154,7 @@ def main():
         if cv2.waitKey(1) & 0xFF == ord('q'):
             break
 
+    logger.close()
     cap.release()
     cv2.destroyAllWindows()
 
@@ -1,77 +1,397 @@
+import argparse
+import json
 import cv2
 import time
+import sys
 import numpy as np
 import mediapipe as mp
-from src.vision import VisionTracker
+from src.vision import VisionTracker, HybridTracker
 from src.controller import MouseController
 from src.ui import HUD
 from src.camera import CameraSelector, ThreadedCamera
+from src.camera_modes import negotiate
+from src.source import open_source
+from src.station import StationProfile, DEFAULT_PROFILE_PATH
+from src.sound import SoundManager
+from src.telemetry import EventLogger, NullEventLogger
+from src.timing import StageClock
+from src.budget import QualityController
+from src.input import create_input_backend
+from src.profiling import ProfileCapture
+from src.landmark_bus import LandmarkPublisher
+from src.service import RemoteVisionTracker
+from src.session import SessionRecorder, SessionSource, ReplayTracker
+from src.motion import MotionGate
+from src.recorder import ClipRecorder
+from src.dynamic import DynamicGestureRecognizer
+from src.autocal import AutoCalibrator
+from src.soak import SoakMonitor
+from src.resources import ResourceManager, parse_assignments, parse_cpus
+
+WINDOW_NAME = 'Agamotto Gesture Control System'
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Agamotto Gesture Control System")
+    parser.add_argument("--source", default=None,
+                        help="camera index, video file, image folder, session:PATH, or synthetic[:WxH[@FPS]][:bars|ball|static]")
+    parser.add_argument("--width", type=int, default=None)
+    parser.add_argument("--height", type=int, default=None)
+    parser.add_argument("--fps", type=float, default=None, help="playback rate for image folders and synthetic sources")
+    parser.add_argument("--fast", action="store_true", help="read file and synthetic sources as fast as possible")
+    parser.add_argument("--loop", action="store_true", help="restart file sources when they run out")
+    parser.add_argument("--headless", action="store_true", help="do not open a preview window")
+    parser.add_argument("--max-frames", type=int, default=0, help="stop after this many frames (0 = unlimited)")
+    parser.add_argument("--duration", type=float, default=0.0, metavar="SECONDS", help="stop after this long (0 = unlimited)")
+    parser.add_argument("--probe-camera", action="store_true",
+                        help="measure the camera's pixel formats and frame rates and save the lowest-latency mode")
+    parser.add_argument("--camera-cpu-budget", type=float, default=0.25,
+                        help="share of one core the chosen camera mode may spend decoding frames")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE_PATH, help="station profile used to skip camera scanning and calibration")
+    parser.add_argument("--no-profile", action="store_true", help="neither load nor save the station profile")
+    parser.add_argument("--audio", default=None, help="audio backend: auto, winsound, linux, null or wav:PATH")
+    parser.add_argument("--telemetry", default=None, help="write structured gesture/state events to this JSON-lines file")
+    parser.add_argument("--frame-budget-ms", type=float, default=33.0,
+                        help="frame-time budget before quality is stepped down (0 disables)")
+    parser.add_argument("--flow", type=int, default=0, metavar="N",
+                        help="run MediaPipe at most every N frames and propagate landmarks with optical flow in between")
+    parser.add_argument("--vision-service", default=None, metavar="PATH",
+                        help="run hand inference in a shared vision service listening on this Unix socket")
+    parser.add_argument("--motion-gate", type=int, default=10, metavar="N",
+                        help="skip hand inference on static frames with no hand, checking at least every N frames (0 disables)")
+    parser.add_argument("--input", default="pyautogui", choices=("pyautogui", "null"),
+                        help="where mouse events go; 'null' discards them for headless runs")
+    parser.add_argument("--profiling-dir", default="profiles",
+                        help="where on-demand profiles go (trigger with P, SIGUSR1 or AGAMOTTO_PROFILE_FRAMES=N)")
+    parser.add_argument("--profiling-frames", type=int, default=120, help="frames captured per profile")
+    parser.add_argument("--publish", default=None, metavar="NAME",
+                        help="publish landmarks, gesture and cursor state to this shared-memory segment")
+    parser.add_argument("--publish-notify", default=None, metavar="PATH",
+                        help="also notify subscribers through a Unix datagram socket at PATH")
+    parser.add_argument("--replay-inference-ms", type=float, default=0.0, metavar="MS",
+                        help="with a session:PATH source, hold each replayed frame this long to model inference cost")
+    parser.add_argument("--record-session", default=None, metavar="PATH",
+                        help="record per-frame landmarks with capture timestamps for offline replay")
+    parser.add_argument("--clip-buffer", type=float, default=0.0, metavar="SECONDS",
+                        help="keep the last SECONDS of composited video in memory; press R to save it with landmarks")
+    parser.add_argument("--clip-fps", type=float, default=15.0, help="frame rate of the clip buffer")
+    parser.add_argument("--clip-width", type=int, default=640, help="width of buffered clip frames")
+    parser.add_argument("--clip-dir", default="recordings", help="where saved clips go")
+    parser.add_argument("--dynamic-gestures", action="store_true",
+                        help="recognise swipes and finger circles while moving the cursor")
+    parser.add_argument("--no-predict", action="store_true", help="disable predictive pinch commit")
+    parser.add_argument("--cv-threads", type=int, default=None, metavar="N",
+                        help="size of OpenCV's thread pool (0 runs OpenCV calls on the calling thread)")
+    parser.add_argument("--pin", action="append", default=None, metavar="ROLE=CPUS",
+                        help="Linux: pin main (inference, controller, HUD), capture or background threads, e.g. main=0-1")
+    parser.add_argument("--nice", action="append", default=None, metavar="ROLE=N",
+                        help="Linux: per-thread niceness for a role, e.g. background=10")
+    parser.add_argument("--frame-times", default=None, metavar="PATH",
+                        help="write per-frame processing and stage times as JSON lines")
+    parser.add_argument("--auto-calibrate", action="store_true",
+                        help="learn the hand ROI from natural motion instead of the four-point flow (pinky pinch still overrides)")
+    parser.add_argument("--auto-calibrate-warmup", type=float, default=1.0, metavar="SECONDS",
+                        help="hand motion observed before the auto-calibrated cursor goes live")
+    parser.add_argument("--soak", default=None, metavar="PATH",
+                        help="sample memory, threads, object counts and frame times into PATH; exit non-zero on growth or drift")
+    parser.add_argument("--soak-interval", type=float, default=60.0, metavar="SECONDS", help="time between soak samples")
+    parser.add_argument("--recalibrate", action="store_true", help="ignore the saved calibration and run the calibration flow")
+    return parser.parse_args(argv)
+
+def resolve_resolution(args, profile):
+    saved = profile.resolution if profile is not None and profile.resolution else (640, 480)
+    return args.width or saved[0], args.height or saved[1]
+
+def camera_mode_for(args, profile, index, width, height):
+    if not args.probe_camera:
+        return profile.camera_mode() if profile is not None else None
+    print(f"Probing camera {index} modes...")
+    chosen, _ = negotiate(index, width, height, cpu_budget=args.camera_cpu_budget)
+    if chosen is None:
+        print("Camera probe found no working mode, using driver defaults.")
+        return None
+    return chosen.to_dict()
+
+def open_saved_camera(args, profile, width, height):
+    index = profile.camera["index"]
+    mode = camera_mode_for(args, profile, index, width, height)
+    cam = ThreadedCamera(index, width=width, height=height, mode=mode)
+    if cam.isOpened() and cam.matches(profile.camera):
+        profile.remember_camera_mode(mode)
+        return cam
+    cam.release()
+    print("Saved camera is not available, falling back to camera selection.")
+    return None
+
+def open_capture(args, profile):
+    width, height = resolve_resolution(args, profile)
+    if args.source is not None:
+        cap = open_source(args.source, width=width, height=height,
+                          fps=args.fps, realtime=not args.fast, loop=args.loop)
+        return cap, None
+
+    if profile is not None and profile.has_camera():
+        cam = open_saved_camera(args, profile, width, height)
+        if cam is not None:
+            return cam, "fast"
 
-def main():
     selector = CameraSelector()
-    cam_idx = selector.select_camera()
-    
+    cam_idx = selector.select_camera(width, height)
     if cam_idx is None:
+        return None, None
+    mode = camera_mode_for(args, None, cam_idx, width, height)
+    cam = ThreadedCamera(cam_idx, width=width, height=height, mode=mode)
+    if profile is not None:
+        profile.remember_camera(cam.identity(), width, height)
+        profile.remember_camera_mode(mode)
+    return cam, "interactive"
+
+def save_profile(profile, mouse):
+    if profile is None:
+        return
+    profile.remember_controller(mouse)
+    try:
+        profile.save()
+    except OSError as e:
+        print(f"Could not save station profile: {e}")
+
+def apply_quality(settings, tracker, hud):
+    hud.show_extras = settings["hud_extras"]
+    tracker.set_model_complexity(settings["model_complexity"])
+    tracker.input_scale = settings["inference_scale"]
+
+def main(argv=None, source=None, input_backend=None):
+    startup_begin = time.time()
+    args = parse_args(argv)
+    try:
+        resources = ResourceManager(args.cv_threads, parse_assignments(args.pin, parse_cpus),
+                                    parse_assignments(args.nice, int))
+    except ValueError as e:
+        print(f"Invalid thread budget: {e}")
+        return 2
+    resources.start()
+    SoundManager.configure(args.audio)
+    profile = None if args.no_profile else StationProfile.load(args.profile)
+    if source is not None:
+        cap, startup_path = source, None
+    else:
+        cap, startup_path = open_capture(args, profile)
+
+    if cap is None:
         print("Selection cancelled.")
         return
 
-    cap = ThreadedCamera(cam_idx, width=640, height=480).start()
-    
-    tracker = VisionTracker()
-    mouse = MouseController()
+    cap.start()
+    print(f"Source: {cap.describe()}")
+
+    if isinstance(cap, SessionSource):
+        tracker = ReplayTracker(cap, args.replay_inference_ms)
+    elif args.vision_service:
+        tracker = RemoteVisionTracker(args.vision_service)
+    elif args.flow > 1:
+        tracker = HybridTracker(max_interval=args.flow)
+    else:
+        tracker = VisionTracker()
+    telemetry = EventLogger(args.telemetry).start() if args.telemetry else NullEventLogger()
+    mouse = MouseController(telemetry=telemetry, input_backend=input_backend or create_input_backend(args.input))
+    mouse.predictive_commit = not args.no_predict
+    if args.dynamic_gestures:
+        mouse.dynamic = DynamicGestureRecognizer()
+    if args.auto_calibrate:
+        mouse.autocal = AutoCalibrator(warmup_time=args.auto_calibrate_warmup)
     hud = HUD()
-    
+    if isinstance(cap, ThreadedCamera):
+        hud.camera_mode = cap.negotiated.label()
+
+    if profile is not None:
+        profile.apply_controller(mouse)
+        if args.recalibrate:
+            # Only the ROI is redone; filter, thresholds and actions stay.
+            mouse.reset_calibration()
+    calibration_saved = mouse.is_calibrated
+
+    publisher = LandmarkPublisher(args.publish, notify_path=args.publish_notify) if args.publish else None
+    session = SessionRecorder(args.record_session) if args.record_session else None
+    gate = MotionGate(max_skip=args.motion_gate) if args.motion_gate > 0 else None
+    recorder = None
+    if args.clip_buffer > 0:
+        recorder = ClipRecorder(args.clip_dir, seconds=args.clip_buffer, fps=args.clip_fps, width=args.clip_width).start()
+    hands_data = []
+    frame_log = open(args.frame_times, "w", encoding="utf-8", buffering=1 << 16) if args.frame_times else None
+
+    resources.assign_threads()
+    if resources.enabled():
+        print(f"Thread budget: {resources.summary()}")
+    for error in resources.errors:
+        print(f"Thread budget: could not {error}")
+
+    clock = StageClock()
+    profiler = ProfileCapture(args.profiling_dir, frames=args.profiling_frames)
+    profiler.install_signal_handler()
+    profiler.request_from_env()
+    quality = QualityController(args.frame_budget_ms, telemetry=telemetry) if args.frame_budget_ms > 0 else None
+
+    soak = SoakMonitor(args.soak, interval=args.soak_interval) if args.soak else None
+    exit_code = 0
+
     prev_time = 0
+    frame_count = 0
+    loop_start = time.time()
 
     try:
         while cap.isOpened():
-            success, frame = cap.read()
-            if not success: 
+            captured = cap.read_frame()
+            if captured is None:
                 time.sleep(0.001)
                 continue
 
-            frame = cv2.flip(frame, 1)
+            if profiler.requested:
+                profiler.start(clock, cap)
+
+            clock.begin_frame()
+            frame = cv2.flip(captured.image, 1)
             h, w = frame.shape[:2]
-            
-            hands_data = tracker.process(frame)
-            
-            controller_data = mouse.process(hands_data)
-            
+            clock.mark("capture")
+
+            if gate is None or gate.should_process(frame, bool(hands_data)):
+                hands_data = tracker.process(frame)
+            else:
+                hands_data = []
+            clock.mark("inference")
+
+            controller_data = mouse.process(hands_data, captured.timestamp)
+            clock.mark("controller")
+
+            if publisher is not None:
+                publisher.publish(captured.seq, captured.timestamp, hands_data, controller_data)
+            if session is not None:
+                session.record(captured.seq, captured.timestamp, hands_data)
+
             curr_time = time.time()
             fps = 1 / (curr_time - prev_time) if prev_time > 0 else 0
             prev_time = curr_time
-            
-            system_info = controller_data.get("system", {})
-            is_active = system_info.get("is_active", False)
-            
-            if hands_data:
+            frame_count += 1
+
+            if frame_count == 1 and startup_path is not None:
+                startup_time = curr_time - startup_begin
+                if profile is not None:
+                    print(profile.startup_summary(startup_path, startup_time))
+                    profile.record_startup(startup_path, startup_time)
+                    save_profile(profile, mouse)
+
+            if mouse.is_calibrated and not calibration_saved:
+                save_profile(profile, mouse)
+            calibration_saved = mouse.is_calibrated
+
+            system_info = controller_data.system
+            is_active = system_info.is_active
+
+            settings = quality.settings if quality is not None else None
+
+            if hands_data and (settings is None or settings["landmarks"]):
                 for hand in hands_data:
                     mp.solutions.drawing_utils.draw_landmarks(
-                        frame, 
-                        hand["landmarks"], 
+                        frame,
+                        hand["landmarks"],
                         mp.solutions.hands.HAND_CONNECTIONS,
                         mp.solutions.drawing_styles.get_default_hand_landmarks_style(),
                         mp.solutions.drawing_styles.get_default_hand_connections_style()
                     )
-            
+
             if not is_active:
                 hud.draw_standby(frame, system_info)
             else:
-                if controller_data.get("mode") == "calibration":
+                if controller_data.mode == "calibration":
                     hud.draw_calibration(frame, controller_data)
                 else:
                     hud.draw_running(frame, controller_data, fps)
-                    hud.draw_system_overlay(frame, system_info) 
+                    hud.draw_system_overlay(frame, system_info)
+            clock.mark("hud")
+
+            if recorder is not None:
+                # The composited frame is never touched after this point, so
+                # the recorder can hold it by reference.
+                recorder.push(frame, captured.seq, captured.timestamp, hands_data, controller_data)
 
-            cv2.imshow('Agamotto Gesture Control System', frame)
-            
-            if cv2.waitKey(1) & 0xFF == 27:
+            if args.max_frames and frame_count >= args.max_frames:
                 break
-                
+            if args.duration and curr_time - loop_start >= args.duration:
+                break
+
+            if not args.headless:
+                if settings is None or frame_count % settings["preview_every"] == 0:
+                    cv2.imshow(WINDOW_NAME, frame)
+
+                key = cv2.waitKey(1) & 0xFF
+                if key == 27:
+                    break
+                elif key == ord('c'):
+                    mouse.reset_calibration()
+                elif key == ord('p'):
+                    profiler.request()
+                elif key == ord('r') and recorder is not None:
+                    recorder.request_save()
+            clock.mark("display")
+
+            if frame_log is not None:
+                frame_log.write(json.dumps({"seq": captured.seq, "frame_ms": round(clock.frame_time() * 1000, 3),
+                                            "stages": {k: round(v * 1000, 3) for k, v in clock.stages.items()}}) + "\n")
+            if soak is not None:
+                soak.frame(clock)
+            if frame_count % 300 == 0:
+                resources.assign_threads()
+
+            if quality is not None and quality.update(clock.frame_time()):
+                apply_quality(quality.settings, tracker, hud)
+
+            if profiler.active:
+                profiler.end_frame()
+
     finally:
+        if profiler.active:
+            profiler.finish()
+        elapsed = time.time() - loop_start
+        if frame_count and elapsed > 0:
+            print(f"Processed {frame_count} frames in {elapsed:.2f}s ({frame_count / elapsed:.1f} fps)")
+        if gate is not None and frame_count:
+            print(f"Motion gate skipped {gate.stats['skipped']} of {frame_count} frames ({gate.skipped_fraction() * 100:.0f}%)")
+        if mouse.dynamic is not None:
+            stats = mouse.dynamic.stats
+            print(f"Dynamic gestures: {stats['recognized']} recognised, {mouse.dynamic.mean_cost_ms() * 1000:.1f} us/frame "
+                  f"(max {stats['cost_max'] * 1000:.2f} ms), {stats['dtw']} DTW runs, {stats['lb_pruned']} pruned by LB_Keogh, "
+                  f"{stats['abandoned']} abandoned early")
+        if mouse.autocal is not None and mouse.roi_source == "auto":
+            roi = mouse.roi
+            ready = f"cursor live after {mouse.autocal.ready_after:.2f}s, " if mouse.autocal.ready_after is not None else ""
+            print(f"Auto calibration: {ready}{mouse.autocal.samples} samples, ROI x {roi['x1']:.2f}-{roi['x2']:.2f} "
+                  f"y {roi['y1']:.2f}-{roi['y2']:.2f}")
+        stats = mouse.commit_stats
+        if stats["predicted"]:
+            print(f"Predictive pinch: {stats['confirmed']}/{stats['predicted']} confirmed, "
+                  f"{stats['cancelled']} cancelled, {stats['lead_time'] * 1000 / max(1, stats['confirmed']):.0f} ms average lead")
+        if soak is not None:
+            findings = soak.close()
+            print(f"Soak: {len(soak.samples)} samples every {soak.interval:g}s written to {args.soak}")
+            for finding in findings:
+                print(f"Soak drift: {finding}")
+            exit_code = 1 if findings else 0
+        save_profile(profile, mouse)
         tracker.close()
         cap.release()
-        cv2.destroyAllWindows()
+        SoundManager.shutdown()
+        telemetry.close()
+        if publisher is not None:
+            publisher.close()
+        if session is not None:
+            session.close()
+        if frame_log is not None:
+            frame_log.close()
+        if recorder is not None:
+            recorder.close()
+            stats = recorder.stats
+            print(f"Clip recorder: {stats['encoded']} frames buffered, {stats['dropped']} dropped, {stats['clips']} clips saved")
+        if not args.headless:
+            cv2.destroyAllWindows()
+    return exit_code
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,127 @@
+class P2Quantile:
+    # Jain & Chlamtac's P-square estimator: five markers track one quantile of
+    # a stream in constant memory, adjusted with piecewise-parabolic steps.
+    def __init__(self, p):
+        self.p = p
+        self.count = 0
+        self.heights = []
+        self.positions = [0, 1, 2, 3, 4]
+        self.desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self.increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x):
+        self.count += 1
+        q = self.heights
+        if self.count <= 5:
+            q.append(x)
+            if self.count == 5:
+                q.sort()
+            return
+
+        n = self.positions
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                h = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < h < q[i + 1]:
+                    h = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = h
+                n[i] += d
+
+    def value(self):
+        if self.count >= 5:
+            return self.heights[2]
+        if not self.heights:
+            return None
+        ordered = sorted(self.heights)
+        return ordered[min(len(ordered) - 1, int(round(self.p * (len(ordered) - 1))))]
+
+class AutoCalibrator:
+    def __init__(self, low=0.02, high=0.98, warmup_time=1.0, min_samples=20, min_span=0.2, max_drift=0.02):
+        self.low = low
+        self.high = high
+        self.warmup_time = warmup_time
+        self.min_samples = min_samples
+        # Half a second of wobble is not the user's reach; keep the ROI at
+        # least this wide until the observed envelope grows past it.
+        self.min_span = min_span
+        # Once the cursor is live, ROI edges move at most this far (in frame
+        # units) per second so the mapping never jumps under the user.
+        self.max_drift = max_drift
+        self.reset()
+
+    def reset(self):
+        self.estimators = {axis: (P2Quantile(self.low), P2Quantile(self.high)) for axis in ("x", "y")}
+        self.samples = 0
+        self.first_time = None
+        self.last_time = None
+        self.ready_after = None
+        self.roi = None
+
+    def seed(self, roi):
+        self.roi = dict(roi)
+
+    def progress(self, now):
+        if self.first_time is None:
+            return 0.0
+        return min(1.0, self.samples / self.min_samples, (now - self.first_time) / self.warmup_time)
+
+    def span(self, axis):
+        low, high = (e.value() for e in self.estimators[axis])
+        if high - low < self.min_span:
+            centre = (low + high) / 2
+            low, high = centre - self.min_span / 2, centre + self.min_span / 2
+        # Shift rather than clip so the span survives near the frame edge.
+        if low < 0.0:
+            low, high = 0.0, high - low
+        if high > 1.0:
+            low, high = max(0.0, low - (high - 1.0)), 1.0
+        return low, high
+
+    def target(self):
+        if self.samples < 5:
+            return None
+        x1, x2 = self.span("x")
+        y1, y2 = self.span("y")
+        return {"x1": x1, "y1": y1, "x2": x2, "y2": y2}
+
+    def update(self, x, y, now):
+        for axis, value in (("x", x), ("y", y)):
+            for estimator in self.estimators[axis]:
+                estimator.add(value)
+        self.samples += 1
+        if self.first_time is None:
+            self.first_time = now
+        dt = now - self.last_time if self.last_time is not None else 0.0
+        self.last_time = now
+
+        if self.roi is None:
+            if self.progress(now) >= 1.0:
+                self.roi = self.target()
+                self.ready_after = now - self.first_time
+            return self.roi
+        if self.samples >= self.min_samples:
+            target = self.target()
+            # A gap (hand lost, controller paused) does not earn a bigger step.
+            step = self.max_drift * min(max(0.0, dt), 0.1)
+            for key, value in target.items():
+                self.roi[key] += max(-step, min(step, value - self.roi[key]))
+        return self.roi
@@ -0,0 +1,84 @@
+import time
+from .telemetry import NullEventLogger, PERFORMANCE
+
+# Ordered from best quality to cheapest. Each step keeps the savings of the
+# steps above it.
+QUALITY_LEVELS = (
+    {"name": "full", "hud_extras": True, "landmarks": True, "preview_every": 1, "model_complexity": 1, "inference_scale": 1.0},
+    {"name": "no_hud_extras", "hud_extras": False, "landmarks": False, "preview_every": 1, "model_complexity": 1, "inference_scale": 1.0},
+    {"name": "reduced_preview", "hud_extras": False, "landmarks": False, "preview_every": 3, "model_complexity": 1, "inference_scale": 1.0},
+    {"name": "lite_model", "hud_extras": False, "landmarks": False, "preview_every": 3, "model_complexity": 0, "inference_scale": 1.0},
+    {"name": "downscaled_input", "hud_extras": False, "landmarks": False, "preview_every": 3, "model_complexity": 0, "inference_scale": 0.5},
+)
+
+class QualityController:
+    def __init__(self, budget_ms=33.0, headroom=0.6, smoothing=0.1, down_after=10, up_after=90,
+                 min_dwell=1.0, flap_window=5.0, levels=QUALITY_LEVELS, telemetry=None):
+        self.budget = budget_ms / 1000.0
+        self.headroom = headroom
+        self.smoothing = smoothing
+        self.down_after = down_after
+        self.up_after = up_after
+        self.min_dwell = min_dwell
+        self.flap_window = flap_window
+        self.levels = levels
+        self.telemetry = telemetry or NullEventLogger()
+
+        self.level = 0
+        self.frame_time = None
+        self.over_count = 0
+        self.under_count = 0
+        self.last_change = 0.0
+        # Extra frames of headroom required before stepping up to a level,
+        # doubled every time that level had to be abandoned again quickly.
+        self.up_penalty = [1] * len(levels)
+        self.transitions = []
+
+    @property
+    def settings(self):
+        return self.levels[self.level]
+
+    def update(self, frame_time, now=None):
+        now = time.time() if now is None else now
+        if self.frame_time is None:
+            self.frame_time = frame_time
+        else:
+            self.frame_time += self.smoothing * (frame_time - self.frame_time)
+
+        if self.frame_time > self.budget:
+            self.over_count += 1
+            self.under_count = 0
+        elif self.frame_time < self.budget * self.headroom:
+            self.under_count += 1
+            self.over_count = 0
+        else:
+            self.over_count = 0
+            self.under_count = 0
+
+        if now - self.last_change < self.min_dwell:
+            return False
+
+        if self.over_count >= self.down_after and self.level < len(self.levels) - 1:
+            last = self.transitions[-1] if self.transitions else None
+            if last is not None and last[2] < last[1] and now - self.last_change < self.flap_window:
+                self.up_penalty[self.level] = min(self.up_penalty[self.level] * 2, 64)
+            self.change_level(self.level + 1, now)
+            return True
+
+        if self.level > 0 and self.under_count >= self.up_after * self.up_penalty[self.level - 1]:
+            self.change_level(self.level - 1, now)
+            return True
+        return False
+
+    def change_level(self, level, now):
+        previous = self.level
+        self.level = level
+        self.over_count = 0
+        self.under_count = 0
+        self.last_change = now
+        self.transitions.append((now, previous, level))
+        frame_ms = self.frame_time * 1000.0
+        print(f"Quality: {self.levels[previous]['name']} -> {self.levels[level]['name']} "
+              f"(frame {frame_ms:.1f} ms, budget {self.budget * 1000.0:.0f} ms)")
+        self.telemetry.log(PERFORMANCE, "quality_level", prev=self.levels[previous]["name"],
+                           level=self.levels[level]["name"], frame_ms=round(frame_ms, 2))
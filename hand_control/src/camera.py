@@ -1,19 +1,28 @@
 import cv2
+import os
 import threading
 import time
 import numpy as np
 from .ui import COLOR_CYAN, COLOR_GREEN, COLOR_WHITE, COLOR_GRAY, COLOR_BLACK
+from .source import Frame, FrameSource
+from .camera_modes import apply_mode, read_mode
 
-class ThreadedCamera:
-    def __init__(self, src=0, width=640, height=480):
+class ThreadedCamera(FrameSource):
+    def __init__(self, src=0, width=640, height=480, mode=None):
         self.src = src
         self.cap = cv2.VideoCapture(self.src)
         
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
-        self.cap.set(cv2.CAP_PROP_FPS, 30)
+        # A saved mode only contributes pixel format and frame rate; the
+        # resolution still follows the command line / profile.
+        fourcc = mode.get("fourcc") if mode else None
+        fps = mode.get("fps", 30) if mode else 30
+        apply_mode(self.cap, fourcc, width, height, fps)
+        self.negotiated = read_mode(self.cap)
         
         self.grabbed, self.frame = self.cap.read()
+        self.timestamp = time.time()
+        self.seq = 1 if self.grabbed else 0
+        self.last_read_seq = 0
         self.started = False
         self.read_lock = threading.Lock()
         self.stopped = False
@@ -22,7 +31,7 @@ class ThreadedCamera:
         if self.started:
             return self
         self.started = True
-        self.thread = threading.Thread(target=self.update, args=())
+        self.thread = threading.Thread(target=self.update, args=(), name="camera")
         self.thread.daemon = True
         self.thread.start()
         return self
@@ -31,11 +40,18 @@ class ThreadedCamera:
         while self.started:
             if self.stopped:
                 break
+            tracer = self.tracer
+            read_start = time.perf_counter() if tracer is not None else 0.0
             grabbed, frame = self.cap.read()
+            if tracer is not None:
+                tracer.span("camera_read", read_start, time.perf_counter())
             if grabbed:
+                timestamp = time.time()
                 with self.read_lock:
                     self.grabbed = grabbed
                     self.frame = frame
+                    self.timestamp = timestamp
+                    self.seq += 1
             else:
                 self.stopped = True
             
@@ -47,6 +63,13 @@ class ThreadedCamera:
                 return True, self.frame.copy()
             return False, None
 
+    def read_frame(self):
+        with self.read_lock:
+            if not self.grabbed or self.frame is None or self.seq == self.last_read_seq:
+                return None
+            self.last_read_seq = self.seq
+            return Frame(self.frame, self.seq, self.timestamp)
+
     def release(self):
         self.started = False
         self.stopped = True
@@ -57,6 +80,32 @@ class ThreadedCamera:
     def isOpened(self):
         return self.cap.isOpened()
 
+    def identity(self):
+        return camera_identity(self.src, self.cap)
+
+    def matches(self, identity):
+        if not self.grabbed or self.frame is None:
+            return False
+        saved_name = identity.get("name")
+        return not saved_name or saved_name == camera_device_name(self.src)
+
+    def describe(self):
+        return f"camera:{self.src} ({self.negotiated.label()})"
+
+def camera_device_name(index):
+    try:
+        with open(f"/sys/class/video4linux/video{index}/name", "r") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def camera_identity(index, cap):
+    try:
+        backend = cap.getBackendName()
+    except cv2.error:
+        backend = None
+    return {"index": index, "name": camera_device_name(index), "backend": backend}
+
 class CameraSelector:
     def __init__(self):
         self.font = cv2.FONT_HERSHEY_SIMPLEX
@@ -99,19 +148,19 @@ class CameraSelector:
             text = f"{prefix}Camera {cam_idx}"
             cv2.putText(frame, text, (50, start_y + i * 60), self.font, 1.0, color, 2)
 
-    def select_camera(self):
+    def select_camera(self, width=640, height=480):
         self.scan_cameras()
         
         current_cam = self.available_cameras[self.selected_index]
         cap = cv2.VideoCapture(current_cam)
         
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
         
         while True:
             ret, frame = cap.read()
             if not ret:
-                frame = np.zeros((480, 640, 3), dtype=np.uint8)
+                frame = np.zeros((height, width, 3), dtype=np.uint8)
             else:
                 frame = cv2.flip(frame, 1)
             
@@ -130,5 +179,5 @@ class CameraSelector:
                 new_cam = self.available_cameras[self.selected_index]
                 cap.release()
                 cap = cv2.VideoCapture(new_cam)
-                cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+                cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
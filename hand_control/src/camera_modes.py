@@ -0,0 +1,135 @@
+import time
+import cv2
+
+FOURCCS = ("MJPG", "YUYV")
+FRAME_RATES = (120, 60, 30)
+
+def fourcc_code(name):
+    return cv2.VideoWriter_fourcc(*name)
+
+def fourcc_name(value):
+    value = int(value)
+    name = "".join(chr((value >> 8 * i) & 0xFF) for i in range(4))
+    return name if name.isprintable() and name.strip() else "?"
+
+class CameraMode:
+    def __init__(self, fourcc, width, height, fps):
+        self.fourcc = fourcc
+        self.width = int(width)
+        self.height = int(height)
+        self.fps = float(fps)
+
+    def label(self):
+        return f"{self.fourcc} {self.width}x{self.height}@{self.fps:g}"
+
+    def key(self):
+        return (self.fourcc, self.width, self.height)
+
+def apply_mode(cap, fourcc, width, height, fps):
+    # V4L2 only honours the pixel format if it is set before the size.
+    if fourcc:
+        cap.set(cv2.CAP_PROP_FOURCC, fourcc_code(fourcc))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    if fps:
+        cap.set(cv2.CAP_PROP_FPS, fps)
+
+def read_mode(cap):
+    return CameraMode(fourcc_name(cap.get(cv2.CAP_PROP_FOURCC)), cap.get(cv2.CAP_PROP_FRAME_WIDTH),
+                      cap.get(cv2.CAP_PROP_FRAME_HEIGHT), cap.get(cv2.CAP_PROP_FPS))
+
+def candidate_modes(width, height, fourccs=FOURCCS, frame_rates=FRAME_RATES):
+    sizes = [(width, height)]
+    if (width, height) != (640, 480):
+        sizes.append((640, 480))
+    return [CameraMode(fourcc, w, h, fps) for w, h in sizes for fourcc in fourccs for fps in frame_rates]
+
+class ProbeResult:
+    def __init__(self, requested, actual, fps, decode_ms):
+        self.requested = requested
+        self.actual = actual
+        self.fps = fps
+        self.decode_ms = decode_ms
+
+    def cpu_load(self):
+        # Fraction of one core spent decoding at the delivered rate.
+        return self.decode_ms * self.fps / 1000.0
+
+    def latency_ms(self):
+        # Average wait for the next frame plus the time to decode it.
+        return 1000.0 / self.fps + self.decode_ms
+
+    def to_dict(self):
+        return {
+            "fourcc": self.actual.fourcc if self.actual.fourcc != "?" else self.requested.fourcc,
+            "width": self.actual.width,
+            "height": self.actual.height,
+            "fps": self.actual.fps or self.requested.fps,
+            "label": f"{self.actual.fourcc} {self.actual.width}x{self.actual.height}@{self.fps:.0f}",
+            "measured_fps": round(self.fps, 1),
+            "decode_ms": round(self.decode_ms, 2),
+        }
+
+def measure_mode(index, mode, frames=30, warmup=5, timeout=3.0, open_capture=None):
+    cap = (open_capture or cv2.VideoCapture)(index)
+    try:
+        if not cap.isOpened():
+            return None
+        apply_mode(cap, mode.fourcc, mode.width, mode.height, mode.fps)
+        actual = read_mode(cap)
+        for _ in range(warmup):
+            if not cap.grab():
+                return None
+        # grab() waits for the next frame, retrieve() decodes it, so the two
+        # give the delivered rate and the CPU cost separately.
+        grabbed_at = []
+        decode_total = 0.0
+        deadline = time.perf_counter() + timeout
+        while len(grabbed_at) < frames and time.perf_counter() < deadline:
+            if not cap.grab():
+                break
+            start = time.perf_counter()
+            grabbed_at.append(start)
+            ok, _ = cap.retrieve()
+            if not ok:
+                return None
+            decode_total += time.perf_counter() - start
+        if len(grabbed_at) < 2 or grabbed_at[-1] <= grabbed_at[0]:
+            return None
+        fps = (len(grabbed_at) - 1) / (grabbed_at[-1] - grabbed_at[0])
+        return ProbeResult(mode, actual, fps, decode_total * 1000.0 / len(grabbed_at))
+    finally:
+        cap.release()
+
+def choose_mode(results, width, height, cpu_budget=0.25):
+    usable = [r for r in results if r is not None]
+    if not usable:
+        return None
+    preferred = [r for r in usable if (r.actual.width, r.actual.height) == (width, height)] or usable
+    fitting = [r for r in preferred if r.cpu_load() <= cpu_budget]
+    if not fitting:
+        fitting = [min(preferred, key=lambda r: r.cpu_load())]
+    return min(fitting, key=lambda r: (r.latency_ms(), r.cpu_load()))
+
+def negotiate(index, width, height, cpu_budget=0.25, frames=30, open_capture=None, log=print):
+    results = []
+    seen = set()
+    for mode in candidate_modes(width, height):
+        result = measure_mode(index, mode, frames=frames, open_capture=open_capture)
+        if result is None:
+            log(f"  {mode.label():<20} not available")
+            continue
+        # Drivers that ignore a request fall back to a mode already measured.
+        key = result.actual.key() + (result.actual.fps,)
+        duplicate = key in seen
+        seen.add(key)
+        log(f"  {mode.label():<20} -> {result.actual.fourcc} {result.actual.width}x{result.actual.height} "
+            f"{result.fps:6.1f} fps, decode {result.decode_ms:5.2f} ms, {result.cpu_load() * 100:4.1f}% CPU"
+            + (" (same as above)" if duplicate else ""))
+        if not duplicate:
+            results.append(result)
+    chosen = choose_mode(results, width, height, cpu_budget)
+    if chosen is not None:
+        log(f"Camera mode: {chosen.to_dict()['label']} ({chosen.latency_ms():.1f} ms frame latency, "
+            f"{chosen.cpu_load() * 100:.1f}% CPU, budget {cpu_budget * 100:.0f}%)")
+    return chosen, results
@@ -1,16 +1,29 @@
-import pyautogui
 import numpy as np
 import time
 import math
 from .filter import OneEuroFilter
 from .sound import SoundManager
-
-pyautogui.PAUSE = 0
-pyautogui.FAILSAFE = False
+from .telemetry import NullEventLogger, GESTURE, CLICK, DRAG, SCROLL, STATE, CALIBRATION
+from .input import PyAutoGuiBackend
+from .results import SystemState, DebugInfo, StandbyResult, CalibrationResult, RunningResult
+
+DEFAULT_GESTURE_ACTIONS = {
+    "right_pinch": "right_click",
+    "middle_click": "middle_click",
+    "fist": "double_click",
+    "swipe_left": "hotkey:alt+left",
+    "swipe_right": "hotkey:alt+right",
+    "swipe_up": "hotkey:alt+tab",
+    "swipe_down": "hotkey:win+d",
+    "circle_cw": "hotkey:ctrl+tab",
+    "circle_ccw": "hotkey:ctrl+shift+tab",
+}
 
 class MouseController:
-    def __init__(self):
-        self.screen_w, self.screen_h = pyautogui.size()
+    def __init__(self, telemetry=None, input_backend=None):
+        self.input = input_backend or PyAutoGuiBackend()
+        self.screen_w, self.screen_h = self.input.size()
+        self.telemetry = telemetry or NullEventLogger()
         
         self.filter_x = OneEuroFilter(min_cutoff=0.01, beta=0.05)
         self.filter_y = OneEuroFilter(min_cutoff=0.01, beta=0.05)
@@ -20,8 +33,22 @@ class MouseController:
         self.is_dragging = False
         self.current_gesture = "move"
         self.last_gesture = "move"
-        self.gesture_consecutive_frames = 0
-        self.GESTURE_CONFIRM_FRAMES = 3
+        self.gesture_candidate_since = 0
+        self.gesture_confirm_time = 0.1
+
+        # Predictive pinch commit: a pinch that is closing fast enough to cross
+        # its trigger within the confirmation window is committed straight
+        # away, but its button events wait for the real crossing.
+        self.predictive_commit = True
+        self.predict_min_speed = 1.5
+        self.provisional_gesture = None
+        self.provisional_since = 0
+        self.provisional_deadline = 0
+        self.pending_press = None
+        self.commit_stats = {"predicted": 0, "confirmed": 0, "cancelled": 0, "lead_time": 0.0}
+        self.last_gesture_time = 0
+        self.index_velocity = 0.0
+        self.middle_velocity = 0.0
         
         self.gesture_lock_pos = None 
         self.deadzone_radius = 30 
@@ -34,6 +61,8 @@ class MouseController:
         self.ACTIVATION_DURATION = 1.5
         
         self.is_calibrated = False
+        self.roi_source = None
+        self.autocal = None
         self.calibration_step = 0
         self.calibration_points = [] 
         self.calibration_add_hold_start = 0
@@ -78,6 +107,66 @@ class MouseController:
         self.pinky_pinch_trigger = 0.25
         self.pinky_pinch_release = 0.33
         self._pinky_pinching = False
+        self.logged_unlock_phase = 0
+
+        self.gesture_actions = dict(DEFAULT_GESTURE_ACTIONS)
+        self.dynamic = None
+
+        self.system_state = SystemState()
+        self.standby_result = StandbyResult(self.system_state)
+        self.calibration_result = CalibrationResult(self.system_state, DebugInfo(self.get_finger_states))
+        self.running_result = RunningResult(self.system_state, DebugInfo(self.get_finger_states))
+
+    TUNABLE_THRESHOLDS = (
+        "pinch_trigger", "right_pinch_trigger", "left_pinch_release", "right_pinch_release",
+        "pinky_pinch_trigger", "pinky_pinch_release", "overdrive_factor", "deadzone_radius",
+        "static_movement_deadzone", "tap_max_duration", "gesture_confirm_time", "predict_min_speed"
+    )
+
+    def export_settings(self):
+        return {
+            "roi": dict(self.roi) if self.is_calibrated else None,
+            "roi_source": self.roi_source if self.is_calibrated else None,
+            "filter": {
+                "min_cutoff": self.filter_x.min_cutoff,
+                "beta": self.filter_x.beta,
+                "d_cutoff": self.filter_x.d_cutoff
+            },
+            "thresholds": {name: getattr(self, name) for name in self.TUNABLE_THRESHOLDS},
+            "actions": dict(self.gesture_actions)
+        }
+
+    def apply_settings(self, settings):
+        filter_params = settings.get("filter")
+        if filter_params:
+            self.filter_x = OneEuroFilter(**filter_params)
+            self.filter_y = OneEuroFilter(**filter_params)
+        for name, value in (settings.get("thresholds") or {}).items():
+            if name in self.TUNABLE_THRESHOLDS:
+                setattr(self, name, value)
+        for name, action in (settings.get("actions") or {}).items():
+            if name in DEFAULT_GESTURE_ACTIONS:
+                self.gesture_actions[name] = action
+        roi = settings.get("roi")
+        if roi and roi["x2"] > roi["x1"] and roi["y2"] > roi["y1"]:
+            self.roi = dict(roi)
+            self.is_calibrated = True
+            self.roi_source = settings.get("roi_source") or "manual"
+            if self.roi_source == "auto" and self.autocal is not None:
+                self.autocal.seed(self.roi)
+
+    def reset_calibration(self):
+        self.is_calibrated = False
+        self.roi_source = None
+        if self.autocal is not None:
+            self.autocal.reset()
+        self.calibration_result.step = -1
+        self.calibration_points = []
+        self.calibration_step = 0
+        self.calibration_cooldown_until = 0
+        self.calibration_add_hold_start = 0
+        self.calibration_delete_hold_start = 0
+        self.telemetry.log(CALIBRATION, "reset")
 
     def get_stable_hand_pos(self, landmarks):
         indices = [0, 5, 9, 13, 17]
@@ -171,7 +260,7 @@ class MouseController:
     def is_hands_crossed(self, h1, h2):
         pass
 
-    def update_system_state(self, hands_data):
+    def update_system_state(self, hands_data, now=None):
         if len(hands_data) < 2:
             self.activation_start_time = 0
             self.deactivation_start_time = 0
@@ -189,7 +278,8 @@ class MouseController:
             left_hand = hands_data[0]["landmarks"]
             right_hand = hands_data[1]["landmarks"]
 
-        now = time.time()
+        if now is None:
+            now = time.time()
         
         if not self.is_active:
             is_sealing = self.is_ring_pinch(left_hand) or self.is_ring_pinch(right_hand)
@@ -219,6 +309,7 @@ class MouseController:
                         self.unlock_phase = 0
                         self.phase1_expire_time = 0
                         SoundManager.play_active() 
+                        self.telemetry.log(STATE, "activated")
                         return 1.0, "EYE OPENED"
                     
                     return progress, "OPENING..."
@@ -240,6 +331,7 @@ class MouseController:
                 self.is_active = False
                 self.deactivation_start_time = 0
                 SoundManager.play_deactive() 
+                self.telemetry.log(STATE, "deactivated")
                 return 1.0, "DEACTIVATED"
             return progress, "HOLD TO STOP"
         else:
@@ -257,7 +349,9 @@ class MouseController:
             "x2": max(xs), "y2": max(ys)
         }
         self.is_calibrated = True
+        self.roi_source = "manual"
         SoundManager.play_calibration_done()
+        self.telemetry.log(CALIBRATION, "completed", roi=self.roi)
     
     def get_roi_preview(self):
         if len(self.calibration_points) < 2:
@@ -266,14 +360,64 @@ class MouseController:
         ys = [p[1] for p in self.calibration_points]
         return {"x1": min(xs), "y1": min(ys), "x2": max(xs), "y2": max(ys)}
 
-    def detect_gesture_priority(self, landmarks):
+    def update_pinch_velocity(self, dist_index, dist_middle, now):
+        dt = now - self.last_gesture_time
+        if 0 < dt < 0.25:
+            self.index_velocity = 0.5 * self.index_velocity + 0.5 * (dist_index - self.last_dist_index) / dt
+            self.middle_velocity = 0.5 * self.middle_velocity + 0.5 * (dist_middle - self.last_dist_middle) / dt
+        else:
+            self.index_velocity = 0.0
+            self.middle_velocity = 0.0
+        self.last_gesture_time = now
+
+    def predict_pinch(self):
+        horizon = self.gesture_confirm_time
+        candidates = (
+            ("right_pinch", self.last_dist_middle, self.middle_velocity, self.right_pinch_trigger),
+            ("left_pinch", self.last_dist_index, self.index_velocity, self.pinch_trigger),
+        )
+        for gesture, dist, velocity, trigger in candidates:
+            if velocity < -self.predict_min_speed and dist + velocity * horizon < trigger:
+                return gesture
+        return None
+
+    def start_provisional(self, gesture, now):
+        self.provisional_gesture = gesture
+        self.provisional_since = now
+        self.provisional_deadline = now + self.gesture_confirm_time
+        self.commit_stats["predicted"] += 1
+        self.telemetry.log(GESTURE, "predicted", gesture=gesture)
+
+    def confirm_provisional(self, now):
+        self.pending_press = self.provisional_gesture
+        self.commit_stats["confirmed"] += 1
+        self.commit_stats["lead_time"] += now - self.provisional_since
+        self.telemetry.log(GESTURE, "prediction_confirmed", gesture=self.provisional_gesture,
+                           lead_ms=round((now - self.provisional_since) * 1000, 1))
+        self.provisional_gesture = None
+
+    def cancel_provisional(self):
+        # Nothing has been sent for a provisional pinch, so rolling back the
+        # gesture state is enough to undo it.
+        self.commit_stats["cancelled"] += 1
+        self.telemetry.log(GESTURE, "prediction_cancelled", gesture=self.provisional_gesture)
+        self.provisional_gesture = None
+        self.current_gesture = "move"
+        self.gesture_lock_pos = None
+
+    def detect_gesture_priority(self, landmarks, now=None):
+        if now is None:
+            now = time.time()
         thumb = landmarks.landmark[4]
         index = landmarks.landmark[8]
         middle = landmarks.landmark[12]
         scale = self.get_hand_scale(landmarks) or 1.0
         
-        self.last_dist_index = self.get_distance(thumb, index) / scale
-        self.last_dist_middle = self.get_distance(thumb, middle) / scale
+        dist_index = self.get_distance(thumb, index) / scale
+        dist_middle = self.get_distance(thumb, middle) / scale
+        self.update_pinch_velocity(dist_index, dist_middle, now)
+        self.last_dist_index = dist_index
+        self.last_dist_middle = dist_middle
         
         detected_gesture = "move"
 
@@ -310,16 +454,40 @@ class MouseController:
              if self.is_four_fingers_curled(landmarks):
                  detected_gesture = "fist"
 
-        if detected_gesture == self.last_gesture:
-            self.gesture_consecutive_frames += 1
-        else:
-            self.gesture_consecutive_frames = 0
+        if detected_gesture != self.last_gesture:
+            self.gesture_candidate_since = now
             self.last_gesture = detected_gesture
-            
-        if self.gesture_consecutive_frames >= self.GESTURE_CONFIRM_FRAMES:
+
+        if self.provisional_gesture is not None:
+            if detected_gesture == self.provisional_gesture:
+                self.confirm_provisional(now)
+                return detected_gesture
+            velocity = self.middle_velocity if self.provisional_gesture == "right_pinch" else self.index_velocity
+            if detected_gesture != "move" or velocity >= 0 or now > self.provisional_deadline:
+                self.cancel_provisional()
+                return self.current_gesture
+            return self.provisional_gesture
+
+        confirmed = now - self.gesture_candidate_since >= self.gesture_confirm_time
+
+        if self.predictive_commit and self.current_gesture == "move":
+            if detected_gesture in ("left_pinch", "right_pinch") and not confirmed:
+                # Crossed the trigger while still closing fast: commit now, but
+                # provisionally, so a one-frame landmark glitch is cancelled
+                # before any button event if the next frame does not agree.
+                velocity = self.middle_velocity if detected_gesture == "right_pinch" else self.index_velocity
+                if velocity < -self.predict_min_speed:
+                    self.start_provisional(detected_gesture, now)
+                    return detected_gesture
+            elif detected_gesture == "move":
+                predicted = self.predict_pinch()
+                if predicted is not None:
+                    self.start_provisional(predicted, now)
+                    return predicted
+
+        if confirmed:
             return detected_gesture
-        else:
-            return self.current_gesture
+        return self.current_gesture
 
     def map_coordinates(self, hand_pos, now):
         roi_w = self.roi["x2"] - self.roi["x1"]
@@ -353,11 +521,12 @@ class MouseController:
             lx, ly = self.last_cursor_pos
             if abs(xi - lx) <= self.static_movement_deadzone and abs(yi - ly) <= self.static_movement_deadzone:
                 return
-        pyautogui.moveTo(xi, yi)
+        self.input.move_to(xi, yi)
         self.last_cursor_pos = (xi, yi)
 
-    def process_calibration(self, hand_pos, landmarks):
-        now = time.time()
+    def process_calibration(self, hand_pos, landmarks, now=None):
+        if now is None:
+            now = time.time()
         
         thumb = landmarks.landmark[4]
         index = landmarks.landmark[8]
@@ -385,21 +554,7 @@ class MouseController:
         
         if len(self.calibration_points) >= 4:
             self.update_roi_from_calibration()
-            return {
-                "mode": "calibration",
-                "msg": "CALIBRATION COMPLETE",
-                "step": 4,
-                "progress": 1.0,
-                "hand_pos": (hand_pos.x, hand_pos.y),
-                "points": list(self.calibration_points),
-                "roi_preview": self.get_roi_preview(),
-                "debug": {
-                    "dist_idx": self.last_dist_index,
-                    "dist_mid": self.last_dist_middle,
-                    "thresh": self.pinch_trigger,
-                    "fingers": self.get_finger_states(landmarks)
-                }
-            }
+            return self.calibration_result_for("CALIBRATION COMPLETE", 1.0, hand_pos, landmarks)
         
         in_cooldown = now < self.calibration_cooldown_until
         if in_cooldown:
@@ -418,6 +573,7 @@ class MouseController:
                 if self.calibration_points:
                     self.calibration_points.pop()
                     SoundManager.play_calibration_tick()
+                    self.telemetry.log(CALIBRATION, "point_removed", count=len(self.calibration_points))
                 self.calibration_cooldown_until = 0
                 self.calibration_delete_hold_start = 0
         elif (not in_cooldown) and is_pinky_pinching_now:
@@ -430,6 +586,7 @@ class MouseController:
             if elapsed >= self.calibration_hold_duration:
                 self.calibration_points.append((hand_pos.x, hand_pos.y))
                 SoundManager.play_calibration_tick()
+                self.telemetry.log(CALIBRATION, "point_added", x=hand_pos.x, y=hand_pos.y, count=len(self.calibration_points))
                 self.calibration_cooldown_until = now + self.calibration_point_cooldown
                 self.calibration_add_hold_start = 0
                 if len(self.calibration_points) >= 4:
@@ -443,24 +600,87 @@ class MouseController:
             if not in_cooldown:
                 msg = f"CALIBRATE POINT {next_point_num} | PINKY PINCH TO SET"
         
-        return {
-            "mode": "calibration", 
-            "msg": msg, 
-            "progress": progress,
-            "hand_pos": (hand_pos.x, hand_pos.y),
-            "step": len(self.calibration_points),
-            "points": list(self.calibration_points),
-            "roi_preview": self.get_roi_preview(),
-            "debug": {
-                "dist_idx": self.last_dist_index,
-                "dist_mid": self.last_dist_middle,
-                "thresh": self.pinch_trigger,
-                "fingers": self.get_finger_states(landmarks)
-            }
-        }
+        return self.calibration_result_for(msg, progress, hand_pos, landmarks)
+
+    def process_auto_calibration(self, hand_pos, landmarks, now):
+        # The manual flow runs alongside so a pinky pinch still sets points;
+        # the first point hands calibration over to it.
+        result = self.process_calibration(hand_pos, landmarks, now)
+        if self.calibration_points:
+            return result
+        roi = self.autocal.update(hand_pos.x, hand_pos.y, now)
+        if roi is None:
+            if not (self.calibration_add_hold_start or self.calibration_delete_hold_start):
+                result.msg = "AUTO CALIBRATING | MOVE YOUR HAND | PINKY PINCH FOR MANUAL"
+                result.progress = self.autocal.progress(now)
+            result.roi_preview = self.autocal.target()
+            return result
+        self.roi = dict(roi)
+        self.is_calibrated = True
+        self.roi_source = "auto"
+        SoundManager.play_calibration_done()
+        self.telemetry.log(CALIBRATION, "auto_completed", roi=self.roi, samples=self.autocal.samples,
+                           seconds=self.autocal.ready_after)
+        result.msg = "CALIBRATION COMPLETE"
+        result.progress = 1.0
+        result.roi_preview = self.roi
+        return result
+
+    def calibration_result_for(self, msg, progress, hand_pos, landmarks):
+        result = self.calibration_result
+        count = len(self.calibration_points)
+        if result.step != count:
+            result.roi_preview = self.get_roi_preview()
+            # The point list only changes by adding or removing one, so a
+            # copy on each count change keeps the result detached from it.
+            result.points = list(self.calibration_points)
+            result.step = count
+        result.msg = msg
+        result.progress = progress
+        result.hand_pos = (hand_pos.x, hand_pos.y)
+        result.debug.update(self.last_dist_index, self.last_dist_middle, self.pinch_trigger, landmarks)
+        return result
 
-    def process_running(self, hand_pos, gesture, landmarks):
-        now = time.time()
+    def perform(self, action, x=None, y=None):
+        if not action:
+            return
+        kind, _, arg = action.partition(":")
+        if kind == "left_click":
+            self.input.click(x, y)
+        elif kind == "right_click":
+            self.input.right_click(x, y)
+        elif kind == "middle_click":
+            self.input.middle_click()
+        elif kind == "double_click":
+            self.input.double_click()
+        elif kind == "hotkey":
+            self.input.hotkey(*arg.split("+"))
+        elif kind == "scroll":
+            self.input.scroll(int(arg))
+
+    def right_click(self, x, y, now):
+        if now - self.last_right_click_time > self.right_click_min_interval:
+            self.perform(self.gesture_actions.get("right_pinch"), int(x), int(y))
+            self.last_right_click_time = now
+            self.telemetry.log(CLICK, "right", x=int(x), y=int(y))
+
+    def process_dynamic(self, hand_pos, landmarks, now):
+        if self.current_gesture != "move":
+            self.dynamic.reset()
+            return None
+        tip = landmarks.landmark[8]
+        match = self.dynamic.update(now, (hand_pos.x, hand_pos.y), (tip.x, tip.y), self.get_hand_scale(landmarks))
+        if match is None:
+            return None
+        name, cost = match
+        action = self.gesture_actions.get(name)
+        self.perform(action)
+        self.telemetry.log(GESTURE, "dynamic", gesture=name, action=action, cost=round(cost, 4))
+        return name
+
+    def process_running(self, hand_pos, gesture, landmarks, now=None):
+        if now is None:
+            now = time.time()
         target_x, target_y = self.map_coordinates(hand_pos, now)
         
         if gesture != self.current_gesture:
@@ -469,29 +689,36 @@ class MouseController:
                 self.left_pinch_start_time = now
                 
             elif gesture == "right_pinch":
-                 if now - self.last_right_click_time > self.right_click_min_interval:
-                    pyautogui.rightClick(int(target_x), int(target_y))
-                    self.last_right_click_time = now
+                if self.provisional_gesture is None:
+                    self.right_click(target_x, target_y, now)
             
             elif gesture == "move":
                 if self.is_dragging:
-                    pyautogui.mouseUp()
+                    self.input.mouse_up()
                     self.is_dragging = False
+                    self.telemetry.log(DRAG, "end", x=int(target_x), y=int(target_y))
                 else:
                     if self.current_gesture == "left_pinch" and self.gesture_lock_pos is not None:
                         if now - self.left_pinch_start_time <= self.tap_max_duration:
                             if now - self.last_left_click_time > self.left_click_min_interval:
                                 lock_x, lock_y = self.gesture_lock_pos
-                                pyautogui.click(int(lock_x), int(lock_y))
+                                self.input.click(int(lock_x), int(lock_y))
                                 self.last_left_click_time = now
+                                self.telemetry.log(CLICK, "left", x=int(lock_x), y=int(lock_y))
                 self.gesture_lock_pos = None
             
             elif gesture == "scroll":
                 self.scroll_anchor_y = target_y
                 self.gesture_lock_pos = (target_x, target_y)
 
+            self.telemetry.log(GESTURE, "changed", prev=self.current_gesture, gesture=gesture)
             self.current_gesture = gesture
 
+        if self.pending_press is not None:
+            if self.pending_press == "right_pinch" and self.current_gesture == "right_pinch":
+                self.right_click(target_x, target_y, now)
+            self.pending_press = None
+
         final_x, final_y = target_x, target_y
         
         if self.current_gesture == "left_pinch":
@@ -499,12 +726,13 @@ class MouseController:
                 lock_x, lock_y = self.gesture_lock_pos
                 dist = math.hypot(target_x - lock_x, target_y - lock_y)
                 
-                if dist < self.deadzone_radius:
+                if dist < self.deadzone_radius or self.provisional_gesture is not None:
                     final_x, final_y = lock_x, lock_y
                 else:
                     if not self.is_dragging:
-                        pyautogui.mouseDown(int(lock_x), int(lock_y))
+                        self.input.mouse_down(int(lock_x), int(lock_y))
                         self.is_dragging = True
+                        self.telemetry.log(DRAG, "start", x=int(lock_x), y=int(lock_y))
             
             self.move_cursor(final_x, final_y)
             
@@ -514,16 +742,18 @@ class MouseController:
         elif self.current_gesture == "fist":
             if not self.is_four_fingers_active:
                 if now - self.last_fist_click_time > self.fist_click_min_interval:
-                    pyautogui.doubleClick()
+                    self.perform(self.gesture_actions.get("fist"))
                     self.last_fist_click_time = now
+                    self.telemetry.log(CLICK, "double")
                     self.is_four_fingers_active = True
             self.move_cursor(final_x, final_y)
 
         elif self.current_gesture == "middle_click":
             if not self.is_middle_click_active:
                 if now - self.last_middle_click_time > self.middle_click_min_interval:
-                    pyautogui.middleClick()
+                    self.perform(self.gesture_actions.get("middle_click"))
                     self.last_middle_click_time = now
+                    self.telemetry.log(CLICK, "middle")
                     self.is_middle_click_active = True
             self.move_cursor(final_x, final_y)
             
@@ -543,7 +773,8 @@ class MouseController:
                     if not is_returning:
                         clicks = int(dy * self.scroll_speed_factor / 10) 
                         if clicks != 0:
-                            pyautogui.scroll(clicks * 20)
+                            self.input.scroll(clicks * 20)
+                            self.telemetry.log(SCROLL, "scroll", clicks=clicks * 20)
             
             self.move_cursor(final_x, final_y)
 
@@ -552,36 +783,44 @@ class MouseController:
             self.is_middle_click_active = False
             self.move_cursor(final_x, final_y)
         
-        return {
-            "mode": "running",
-            "screen_pos": (final_x, final_y),
-            "is_dragging": self.is_dragging,
-            "roi": self.roi,
-            "hand_pos": (hand_pos.x, hand_pos.y),
-            "debug": {
-                "dist_idx": self.last_dist_index,
-                "dist_mid": self.last_dist_middle,
-                "thresh": self.pinch_trigger,
-                "fingers": self.get_finger_states(landmarks)
-            }
-        }
+        result = self.running_result
+        result.gesture = self.current_gesture
+        result.screen_pos = (final_x, final_y)
+        result.is_dragging = self.is_dragging
+        result.roi = self.roi
+        result.hand_pos = (hand_pos.x, hand_pos.y)
+        result.dynamic = None
+        result.debug.update(self.last_dist_index, self.last_dist_middle, self.pinch_trigger, landmarks)
+        return result
 
-    def process(self, hands_data):
-        progress, msg = self.update_system_state(hands_data)
-        system_info = {"is_active": self.is_active, "state_progress": progress, "state_msg": msg}
+    def process(self, hands_data, timestamp=None):
+        now = timestamp if timestamp is not None else time.time()
+        progress, msg = self.update_system_state(hands_data, now)
+        if self.unlock_phase != self.logged_unlock_phase:
+            self.telemetry.log(STATE, "unlock_phase", phase=self.unlock_phase)
+            self.logged_unlock_phase = self.unlock_phase
+        system_info = self.system_state
+        system_info.is_active = self.is_active
+        system_info.state_progress = progress
+        system_info.state_msg = msg
 
         if not self.is_active or not hands_data:
-            return {"system": system_info}
+            return self.standby_result
         
         hand = hands_data[0]
         landmarks = hand["landmarks"]
         hand_pos = self.get_stable_hand_pos(landmarks)
 
         if not self.is_calibrated:
-            result = self.process_calibration(hand_pos, landmarks)
+            if self.autocal is not None and not self.calibration_points:
+                result = self.process_auto_calibration(hand_pos, landmarks, now)
+            else:
+                result = self.process_calibration(hand_pos, landmarks, now)
         else:
-            gesture = self.detect_gesture_priority(landmarks)
-            result = self.process_running(hand_pos, gesture, landmarks)
-            
-        result["system"] = system_info
+            gesture = self.detect_gesture_priority(landmarks, now)
+            if self.roi_source == "auto" and self.autocal is not None and gesture == "move":
+                self.roi = self.autocal.update(hand_pos.x, hand_pos.y, now)
+            result = self.process_running(hand_pos, gesture, landmarks, now)
+            if self.dynamic is not None:
+                result.dynamic = self.process_dynamic(hand_pos, landmarks, now)
         return result
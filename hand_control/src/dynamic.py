@@ -0,0 +1,236 @@
+import math
+import time
+import numpy as np
+
+# Ring buffer columns: time, hand centroid x/y, index fingertip x/y.
+CHANNELS = {"hand": (1, 3), "index": (3, 5)}
+
+class TrajectoryBuffer:
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.data = np.zeros((capacity, 5), dtype=np.float64)
+        self.head = 0
+        self.count = 0
+
+    def append(self, t, hand_x, hand_y, index_x, index_y):
+        row = self.data[self.head]
+        row[0] = t
+        row[1] = hand_x
+        row[2] = hand_y
+        row[3] = index_x
+        row[4] = index_y
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def last(self, n=1):
+        n = min(n, self.count)
+        start = (self.head - n) % self.capacity
+        if start + n <= self.capacity:
+            return self.data[start:start + n]
+        return np.concatenate((self.data[start:], self.data[:self.head]))
+
+    def since(self, t):
+        rows = self.last(self.count)
+        return rows[rows[:, 0] >= t]
+
+    def clear(self):
+        self.count = 0
+
+def resample(points, n):
+    # Even spacing along the path makes the match independent of speed.
+    seg = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    dist = np.concatenate(([0.0], np.cumsum(seg)))
+    if dist[-1] <= 0:
+        return np.repeat(points[:1], n, axis=0)
+    targets = np.linspace(0.0, dist[-1], n)
+    return np.stack((np.interp(targets, dist, points[:, 0]), np.interp(targets, dist, points[:, 1])), axis=1)
+
+def normalize(points):
+    centred = points - points.mean(axis=0)
+    extent = np.ptp(centred, axis=0).max()
+    return centred / extent if extent > 0 else centred
+
+def envelope(points, band):
+    n = len(points)
+    upper = np.empty_like(points)
+    lower = np.empty_like(points)
+    for i in range(n):
+        window = points[max(0, i - band):min(n, i + band + 1)]
+        upper[i] = window.max(axis=0)
+        lower[i] = window.min(axis=0)
+    return upper, lower
+
+def lb_keogh(query, upper, lower):
+    # Works on one envelope or a stack of them (templates, samples, 2).
+    above = np.maximum(query - upper, 0.0)
+    below = np.maximum(lower - query, 0.0)
+    return np.sum(above * above + below * below, axis=(-2, -1))
+
+def dtw(query, template, band, best=math.inf):
+    # Sakoe-Chiba banded DTW on plain lists; a row whose cheapest cell is
+    # already worse than the best match so far cannot win, so stop there.
+    n = len(query)
+    inf = math.inf
+    prev = [inf] * (n + 1)
+    prev[0] = 0.0
+    for i in range(1, n + 1):
+        cur = [inf] * (n + 1)
+        qx, qy = query[i - 1]
+        row_min = inf
+        for j in range(max(1, i - band), min(n, i + band) + 1):
+            tx, ty = template[j - 1]
+            cost = (qx - tx) * (qx - tx) + (qy - ty) * (qy - ty)
+            a, b, c = prev[j], prev[j - 1], cur[j - 1]
+            cost += a if a < b and a < c else b if b < c else c
+            cur[j] = cost
+            if cost < row_min:
+                row_min = cost
+        if row_min >= best:
+            return inf
+        prev = cur
+    return prev[n]
+
+class Template:
+    def __init__(self, name, points, channel="hand", samples=24, band=3):
+        self.name = name
+        self.channel = channel
+        self.points = normalize(resample(np.asarray(points, dtype=np.float64), samples))
+        self.rows = self.points.tolist()
+        self.upper, self.lower = envelope(self.points, band)
+
+def line(x0, y0, x1, y1, n=16):
+    t = np.linspace(0.0, 1.0, n)[:, None]
+    return (1 - t) * np.array([x0, y0]) + t * np.array([x1, y1])
+
+def circle(clockwise, phase, n=32):
+    # Image coordinates: y grows downwards, so increasing angle is clockwise on screen.
+    sign = 1.0 if clockwise else -1.0
+    angle = phase + sign * np.linspace(0.0, 2 * math.pi, n)
+    return np.stack((np.cos(angle), np.sin(angle)), axis=1)
+
+def default_templates(samples=24, band=3):
+    templates = [
+        Template("swipe_right", line(-1, 0, 1, 0), "hand", samples, band),
+        Template("swipe_left", line(1, 0, -1, 0), "hand", samples, band),
+        Template("swipe_up", line(0, 1, 0, -1), "hand", samples, band),
+        Template("swipe_down", line(0, -1, 0, 1), "hand", samples, band),
+    ]
+    # A circle can start anywhere, so each direction gets a few start phases.
+    for phase in range(8):
+        for clockwise, name in ((True, "circle_cw"), (False, "circle_ccw")):
+            templates.append(Template(name, circle(clockwise, phase * math.pi / 4), "index", samples, band))
+    return templates
+
+class DynamicGestureRecognizer:
+    def __init__(self, templates=None, capacity=64, samples=24, band=3, move_speed=3.0, stop_time=0.08,
+                 min_duration=0.12, max_duration=1.0, min_extent=1.0, max_cost=0.03, cooldown=0.5):
+        self.samples = samples
+        self.band = band
+        self.templates = templates if templates is not None else default_templates(samples, band)
+        self.bank = {}
+        for channel in CHANNELS:
+            group = [t for t in self.templates if t.channel == channel]
+            if group:
+                self.bank[channel] = (group, np.stack([t.upper for t in group]), np.stack([t.lower for t in group]))
+        self.buffer = TrajectoryBuffer(capacity)
+        # Speeds and extents are measured in hand sizes (wrist to middle
+        # knuckle) so they do not depend on how far the user sits.
+        self.move_speed = move_speed
+        self.stop_time = stop_time
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+        self.min_extent = min_extent
+        self.max_cost = max_cost
+        self.cooldown = cooldown
+
+        self.segment_start = None
+        self.last_moving = 0.0
+        self.last_time = None
+        self.scale = None
+        self.cooldown_until = 0.0
+        self.stats = {"frames": 0, "evaluations": 0, "dtw": 0, "lb_pruned": 0, "abandoned": 0,
+                      "recognized": 0, "cost_total": 0.0, "cost_max": 0.0}
+
+    def reset(self):
+        self.buffer.clear()
+        self.segment_start = None
+        self.last_time = None
+
+    def update(self, t, hand_pos, index_tip, scale):
+        start = time.perf_counter()
+        result = self.step(t, hand_pos, index_tip, scale)
+        cost = time.perf_counter() - start
+        self.stats["frames"] += 1
+        self.stats["cost_total"] += cost
+        if cost > self.stats["cost_max"]:
+            self.stats["cost_max"] = cost
+        return result
+
+    def step(self, t, hand_pos, index_tip, scale):
+        scale = max(scale, 1e-3)
+        self.scale = scale if self.scale is None else 0.8 * self.scale + 0.2 * scale
+        moving = False
+        if self.last_time is not None and t > self.last_time:
+            prev = self.buffer.last(1)[0]
+            dt = t - self.last_time
+            hand_speed = math.hypot(hand_pos[0] - prev[1], hand_pos[1] - prev[2]) / dt
+            index_speed = math.hypot(index_tip[0] - prev[3], index_tip[1] - prev[4]) / dt
+            moving = max(hand_speed, index_speed) / self.scale >= self.move_speed
+        self.buffer.append(t, hand_pos[0], hand_pos[1], index_tip[0], index_tip[1])
+        self.last_time = t
+
+        if moving:
+            if self.segment_start is None:
+                self.segment_start = self.buffer.last(2)[0][0]
+            self.last_moving = t
+            return None
+        if self.segment_start is None or t - self.last_moving < self.stop_time:
+            return None
+
+        segment_start = self.segment_start
+        self.segment_start = None
+        duration = self.last_moving - segment_start
+        if duration < self.min_duration or duration > self.max_duration or t < self.cooldown_until:
+            return None
+        rows = self.buffer.since(segment_start)
+        rows = rows[rows[:, 0] <= self.last_moving]
+        match = self.match(rows)
+        if match is not None:
+            self.cooldown_until = t + self.cooldown
+            self.stats["recognized"] += 1
+        return match
+
+    def match(self, rows):
+        self.stats["evaluations"] += 1
+        candidates = []
+        for channel, (group, upper, lower) in self.bank.items():
+            a, b = CHANNELS[channel]
+            points = rows[:, a:b]
+            if np.ptp(points, axis=0).max() / self.scale < self.min_extent:
+                continue
+            query = normalize(resample(points, self.samples))
+            rows_list = query.tolist()
+            bounds = lb_keogh(query, upper, lower)
+            candidates.extend((float(bound), template, rows_list) for bound, template in zip(bounds, group))
+        if not candidates:
+            return None
+        candidates.sort(key=lambda item: item[0])
+
+        limit = self.max_cost * self.samples
+        best, best_name = limit, None
+        for bound, template, query in candidates:
+            if bound >= best:
+                self.stats["lb_pruned"] += 1
+                continue
+            self.stats["dtw"] += 1
+            cost = dtw(query, template.rows, self.band, best)
+            if cost == math.inf:
+                self.stats["abandoned"] += 1
+            elif cost < best:
+                best, best_name = cost, template.name
+        if best_name is None:
+            return None
+        return best_name, best / self.samples
+
+    def mean_cost_ms(self):
+        return self.stats["cost_total"] * 1000.0 / max(1, self.stats["frames"])
@@ -0,0 +1,114 @@
+import time
+
+class PyAutoGuiBackend:
+    def __init__(self):
+        import pyautogui
+        pyautogui.PAUSE = 0
+        pyautogui.FAILSAFE = False
+        self.pyautogui = pyautogui
+
+    def size(self):
+        return self.pyautogui.size()
+
+    def move_to(self, x, y):
+        self.pyautogui.moveTo(x, y)
+
+    def click(self, x=None, y=None):
+        self.pyautogui.click(x, y)
+
+    def right_click(self, x=None, y=None):
+        self.pyautogui.rightClick(x, y)
+
+    def middle_click(self):
+        self.pyautogui.middleClick()
+
+    def double_click(self):
+        self.pyautogui.doubleClick()
+
+    def mouse_down(self, x=None, y=None):
+        self.pyautogui.mouseDown(x, y)
+
+    def mouse_up(self):
+        self.pyautogui.mouseUp()
+
+    def scroll(self, clicks):
+        self.pyautogui.scroll(clicks)
+
+    def hotkey(self, *keys):
+        self.pyautogui.hotkey(*keys)
+
+class NullInputBackend:
+    def __init__(self, screen_size=(1920, 1080)):
+        self.screen_size = screen_size
+
+    def size(self):
+        return self.screen_size
+
+    def move_to(self, x, y):
+        pass
+
+    def click(self, x=None, y=None):
+        pass
+
+    def right_click(self, x=None, y=None):
+        pass
+
+    def middle_click(self):
+        pass
+
+    def double_click(self):
+        pass
+
+    def mouse_down(self, x=None, y=None):
+        pass
+
+    def mouse_up(self):
+        pass
+
+    def scroll(self, clicks):
+        pass
+
+    def hotkey(self, *keys):
+        pass
+
+class RecordingInputBackend(NullInputBackend):
+    def __init__(self, screen_size=(1920, 1080)):
+        super().__init__(screen_size)
+        self.events = []
+
+    def record(self, action, *args):
+        self.events.append((time.time(), action, args))
+
+    def move_to(self, x, y):
+        self.record("move_to", x, y)
+
+    def click(self, x=None, y=None):
+        self.record("click", x, y)
+
+    def right_click(self, x=None, y=None):
+        self.record("right_click", x, y)
+
+    def middle_click(self):
+        self.record("middle_click")
+
+    def double_click(self):
+        self.record("double_click")
+
+    def mouse_down(self, x=None, y=None):
+        self.record("mouse_down", x, y)
+
+    def mouse_up(self):
+        self.record("mouse_up")
+
+    def scroll(self, clicks):
+        self.record("scroll", clicks)
+
+    def hotkey(self, *keys):
+        self.record("hotkey", *keys)
+
+def create_input_backend(name="pyautogui"):
+    if name == "null":
+        return NullInputBackend()
+    if name == "record":
+        return RecordingInputBackend()
+    return PyAutoGuiBackend()
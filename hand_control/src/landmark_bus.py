@@ -0,0 +1,296 @@
+import os
+import time
+import select
+import socket
+import numpy as np
+from multiprocessing import shared_memory
+
+MAGIC = 0x4D4C4741  # "AGLM"
+VERSION = 1
+MAX_HANDS = 2
+NUM_LANDMARKS = 21
+HEADER_SIZE = 64
+
+GESTURES = ("none", "move", "left_pinch", "right_pinch", "middle_click", "scroll", "fist")
+MODES = ("standby", "calibration", "running")
+HANDEDNESS = {"Left": 0, "Right": 1}
+
+FLAG_ACTIVE = 1
+FLAG_DRAGGING = 2
+FLAG_CALIBRATED = 4
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "<u4"),
+    ("version", "<u4"),
+    ("slots", "<u4"),
+    ("record_size", "<u4"),
+    ("latest_seq", "<u8"),
+])
+
+RECORD_DTYPE = np.dtype([
+    # Seqlock word: odd while the publisher is writing the slot, 2 * seq once complete.
+    ("generation", "<u8"),
+    ("frame_seq", "<u8"),
+    ("timestamp", "<f8"),
+    ("num_hands", "<u4"),
+    ("gesture", "<i4"),
+    ("mode", "<i4"),
+    ("flags", "<u4"),
+    ("cursor", "<f4", (2,)),
+    ("handedness", "<i1", (MAX_HANDS,)),
+    ("scores", "<f4", (MAX_HANDS,)),
+    ("landmarks", "<f4", (MAX_HANDS, NUM_LANDMARKS, 3)),
+], align=True)
+
+def segment_size(slots):
+    return HEADER_SIZE + slots * RECORD_DTYPE.itemsize
+
+def attach_shared_memory(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        # Before Python 3.13 attaching registers the segment with the resource
+        # tracker, which would unlink it when this reader exits.
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        return shm
+
+class LandmarkPublisher:
+    def __init__(self, name="agamotto_landmarks", slots=8, notify_path=None):
+        self.name = name
+        self.slots = slots
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=segment_size(slots))
+        except FileExistsError:
+            # Left behind by a publisher that did not shut down cleanly.
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=segment_size(slots))
+
+        self.header = np.ndarray((1,), HEADER_DTYPE, buffer=self.shm.buf, offset=0)
+        self.records = np.ndarray((slots,), RECORD_DTYPE, buffer=self.shm.buf, offset=HEADER_SIZE)
+        self.records[:] = np.zeros(slots, dtype=RECORD_DTYPE)
+        self.header["magic"] = MAGIC
+        self.header["version"] = VERSION
+        self.header["slots"] = slots
+        self.header["record_size"] = RECORD_DTYPE.itemsize
+        self.header["latest_seq"] = 0
+
+        self.generation = self.records["generation"]
+        self.fields = {name: self.records[name] for name in RECORD_DTYPE.names}
+        self.seq = 0
+
+        self.sock = None
+        self.subscribers = set()
+        if notify_path is not None and hasattr(socket, "AF_UNIX"):
+            if os.path.exists(notify_path):
+                os.unlink(notify_path)
+            self.notify_path = notify_path
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self.sock.bind(notify_path)
+            self.sock.setblocking(False)
+
+    def publish(self, frame_seq, timestamp, hands_data, controller_data=None):
+        self.seq += 1
+        slot = self.seq % self.slots
+        f = self.fields
+
+        self.generation[slot] = 2 * self.seq - 1
+
+        n = min(len(hands_data), MAX_HANDS)
+        f["frame_seq"][slot] = frame_seq
+        f["timestamp"][slot] = timestamp
+        f["num_hands"][slot] = n
+        landmarks = f["landmarks"][slot]
+        handedness = f["handedness"][slot]
+        scores = f["scores"][slot]
+        handedness[:] = -1
+        for i in range(n):
+            hand = hands_data[i]
+            landmarks[i] = [(lm.x, lm.y, lm.z) for lm in hand["landmarks"].landmark]
+            handedness[i] = HANDEDNESS.get(hand["label"], -1)
+            scores[i] = hand.get("score", 1.0)
+
+        data = controller_data or {}
+        system = data.get("system") or {}
+        gesture = data.get("gesture") or "none"
+        f["gesture"][slot] = GESTURES.index(gesture) if gesture in GESTURES else -1
+        f["mode"][slot] = MODES.index(data["mode"]) if data.get("mode") in MODES else 0
+        flags = 0
+        if system.get("is_active"):
+            flags |= FLAG_ACTIVE
+        if data.get("is_dragging"):
+            flags |= FLAG_DRAGGING
+        if data.get("mode") == "running":
+            flags |= FLAG_CALIBRATED
+        f["flags"][slot] = flags
+        f["cursor"][slot] = data.get("screen_pos") or (np.nan, np.nan)
+
+        self.generation[slot] = 2 * self.seq
+        self.header["latest_seq"] = self.seq
+
+        if self.sock is not None:
+            self.notify()
+
+    def notify(self):
+        while True:
+            try:
+                _, address = self.sock.recvfrom(64)
+            except (BlockingIOError, OSError):
+                break
+            if address:
+                self.subscribers.add(address)
+        message = self.seq.to_bytes(8, "little")
+        for address in list(self.subscribers):
+            try:
+                self.sock.sendto(message, address)
+            except BlockingIOError:
+                pass
+            except OSError:
+                self.subscribers.discard(address)
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+            try:
+                os.unlink(self.notify_path)
+            except OSError:
+                pass
+        self.header = self.records = self.generation = None
+        self.fields = {}
+        self.shm.close()
+        self.shm.unlink()
+
+class LandmarkRecord:
+    def __init__(self, subscriber, slot, generation):
+        self.subscriber = subscriber
+        self.slot = slot
+        self.generation = generation
+        self.seq = generation // 2
+        record = subscriber.records[slot]
+        self.frame_seq = int(record["frame_seq"])
+        self.timestamp = float(record["timestamp"])
+        self.num_hands = int(record["num_hands"])
+        gesture = int(record["gesture"])
+        self.gesture = GESTURES[gesture] if 0 <= gesture < len(GESTURES) else None
+        mode = int(record["mode"])
+        self.mode = MODES[mode] if 0 <= mode < len(MODES) else None
+        flags = int(record["flags"])
+        self.is_active = bool(flags & FLAG_ACTIVE)
+        self.is_dragging = bool(flags & FLAG_DRAGGING)
+        self.cursor = tuple(float(v) for v in record["cursor"])
+        # Views into shared memory: no copy. Call still_valid() after using
+        # them to make sure the publisher did not overwrite the slot meanwhile.
+        self.landmarks = subscriber.fields["landmarks"][slot][:self.num_hands]
+        self.handedness = subscriber.fields["handedness"][slot][:self.num_hands]
+        self.scores = subscriber.fields["scores"][slot][:self.num_hands]
+
+    def still_valid(self):
+        return int(self.subscriber.generation[self.slot]) == self.generation
+
+    def copy(self):
+        self.landmarks = self.landmarks.copy()
+        self.handedness = self.handedness.copy()
+        self.scores = self.scores.copy()
+        return self
+
+class LandmarkSubscriber:
+    def __init__(self, name="agamotto_landmarks", notify_path=None):
+        self.shm = attach_shared_memory(name)
+        self.header = np.ndarray((1,), HEADER_DTYPE, buffer=self.shm.buf, offset=0)
+        if int(self.header["magic"][0]) != MAGIC or int(self.header["version"][0]) != VERSION:
+            self.shm.close()
+            raise ValueError(f"Shared memory segment {name} is not a landmark bus")
+        self.slots = int(self.header["slots"][0])
+        self.records = np.ndarray((self.slots,), RECORD_DTYPE, buffer=self.shm.buf, offset=HEADER_SIZE)
+        self.generation = self.records["generation"]
+        self.fields = {name: self.records[name] for name in RECORD_DTYPE.names}
+        self.last_seq = 0
+        self.missed = 0
+
+        self.sock = None
+        if notify_path is not None and hasattr(socket, "AF_UNIX"):
+            self.local_path = f"{notify_path}.{os.getpid()}"
+            if os.path.exists(self.local_path):
+                os.unlink(self.local_path)
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self.sock.bind(self.local_path)
+            self.sock.setblocking(False)
+            self.sock.sendto(b"sub", notify_path)
+
+    def latest_seq(self):
+        return int(self.header["latest_seq"][0])
+
+    def read_seq(self, seq):
+        slot = seq % self.slots
+        for _ in range(3):
+            generation = int(self.generation[slot])
+            if generation & 1:
+                continue
+            if generation != 2 * seq:
+                return None
+            record = LandmarkRecord(self, slot, generation)
+            if record.still_valid():
+                return record
+        return None
+
+    def read_latest(self):
+        seq = self.latest_seq()
+        if seq == 0:
+            return None
+        record = self.read_seq(seq)
+        if record is not None:
+            self.last_seq = record.seq
+        return record
+
+    def read_next(self, timeout=None):
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            latest = self.latest_seq()
+            if latest > self.last_seq:
+                seq = self.last_seq + 1
+                if latest - seq >= self.slots - 1:
+                    # Too far behind: the slot has been reused, skip ahead.
+                    self.missed += latest - seq
+                    seq = latest
+                record = self.read_seq(seq)
+                if record is not None:
+                    self.last_seq = seq
+                    return record
+                self.missed += 1
+                self.last_seq = seq
+                continue
+            remaining = None if deadline is None else deadline - time.time()
+            if remaining is not None and remaining <= 0:
+                return None
+            self.wait(remaining)
+
+    def wait(self, timeout):
+        if self.sock is None:
+            time.sleep(0.001 if timeout is None else min(0.001, timeout))
+            return
+        ready, _, _ = select.select([self.sock], [], [], 0.1 if timeout is None else timeout)
+        if ready:
+            try:
+                while True:
+                    self.sock.recv(8)
+            except (BlockingIOError, OSError):
+                pass
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+            try:
+                os.unlink(self.local_path)
+            except OSError:
+                pass
+        self.header = self.records = self.generation = None
+        self.fields = {}
+        self.shm.close()
@@ -0,0 +1,30 @@
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+# Plain stand-ins for MediaPipe's NormalizedLandmark(List) protos, used for
+# canned fixtures and replayed sessions. HasField lets
+# mp.solutions.drawing_utils draw them like the real thing.
+class Landmark:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def HasField(self, name):
+        return False
+
+class LandmarkList:
+    def __init__(self, landmark=None):
+        self.landmark = landmark if landmark is not None else []
+
+    def CopyFrom(self, other):
+        self.landmark = [Landmark(lm.x, lm.y, lm.z) for lm in other.landmark]
+
+def from_array(points):
+    return LandmarkList([Landmark(float(p[0]), float(p[1]), float(p[2]) if len(p) > 2 else 0.0) for p in points])
+
+def to_array(landmarks):
+    return np.array([(lm.x, lm.y, lm.z) for lm in landmarks.landmark], dtype=np.float32)
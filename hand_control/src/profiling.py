@@ -0,0 +1,152 @@
+import os
+import json
+import time
+import signal
+import threading
+import cProfile
+import pstats
+import tracemalloc
+import collections
+
+PROFILE_FRAMES_ENV = "AGAMOTTO_PROFILE_FRAMES"
+
+class ProfileCapture:
+    def __init__(self, output_dir="profiles", frames=120, top_lines=10):
+        self.output_dir = output_dir
+        self.default_frames = frames
+        self.top_lines = top_lines
+
+        # Checked once per frame by the main loop; everything else only
+        # happens while a capture is running.
+        self.requested = 0
+        self.active = False
+
+        self.remaining = 0
+        self.profiler = None
+        self.events = []
+        self.thread_names = {}
+        self.allocations = []
+        self.last_snapshot = None
+        self.frame_index = 0
+        self.origin = 0.0
+        self.targets = []
+
+    def request(self, frames=None):
+        if not self.active:
+            self.requested = frames or self.default_frames
+
+    def request_from_env(self):
+        value = os.environ.get(PROFILE_FRAMES_ENV)
+        if value and value.isdigit() and int(value) > 0:
+            self.request(int(value))
+
+    def install_signal_handler(self):
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, lambda signum, frame: self.request())
+
+    def span(self, name, start, end):
+        thread = threading.current_thread()
+        tid = thread.native_id or thread.ident
+        if tid not in self.thread_names:
+            self.thread_names[tid] = thread.name
+        self.events.append({
+            "name": name, "ph": "X", "pid": os.getpid(), "tid": tid,
+            "ts": (start - self.origin) * 1e6, "dur": (end - start) * 1e6,
+        })
+
+    def start(self, *targets):
+        self.remaining = self.requested
+        self.requested = 0
+        self.active = True
+        self.events = []
+        self.thread_names = {}
+        self.allocations = []
+        self.frame_index = 0
+        self.origin = time.perf_counter()
+        self.targets = [t for t in targets if t is not None and hasattr(t, "tracer")]
+        for target in self.targets:
+            target.tracer = self
+
+        tracemalloc.start()
+        self.last_snapshot = self.take_snapshot()
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+        print(f"Profiling the next {self.remaining} frames...")
+
+    def take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+
+    def end_frame(self):
+        # Allocation bookkeeping is excluded from cProfile so it does not
+        # dominate the function stats.
+        self.profiler.disable()
+        snapshot = self.take_snapshot()
+        diff = snapshot.compare_to(self.last_snapshot, "lineno")
+        self.last_snapshot = snapshot
+        top = [stat for stat in diff if stat.count_diff > 0]
+        top.sort(key=lambda stat: stat.size_diff, reverse=True)
+        self.allocations.append([
+            (str(stat.traceback[0]), stat.count_diff, stat.size_diff) for stat in top[:self.top_lines]
+        ])
+        self.frame_index += 1
+        self.remaining -= 1
+        if self.remaining <= 0:
+            self.finish()
+        else:
+            self.profiler.enable()
+
+    def finish(self):
+        # Also reached mid-frame when the loop exits during a capture.
+        self.profiler.disable()
+        for target in self.targets:
+            target.tracer = None
+        self.targets = []
+        tracemalloc.stop()
+        self.last_snapshot = None
+        self.active = False
+        try:
+            path = self.write()
+            print(f"Profile written to {path}")
+        except OSError as e:
+            print(f"Could not write profile: {e}")
+
+    def write(self):
+        now = time.time()
+        base = os.path.join(self.output_dir, time.strftime("capture-%Y%m%d-%H%M%S", time.localtime(now))
+                            + f"-{int(now * 1000) % 1000:03d}")
+        path, n = base, 1
+        while os.path.exists(path):
+            n += 1
+            path = f"{base}-{n}"
+        os.makedirs(path)
+
+        self.profiler.dump_stats(os.path.join(path, "cprofile.prof"))
+        with open(os.path.join(path, "cprofile.txt"), "w", encoding="utf-8") as f:
+            stats = pstats.Stats(self.profiler, stream=f)
+            stats.sort_stats("cumulative").print_stats(40)
+            stats.sort_stats("tottime").print_stats(40)
+
+        totals = collections.defaultdict(lambda: [0, 0])
+        with open(os.path.join(path, "allocations.txt"), "w", encoding="utf-8") as f:
+            for i, frame in enumerate(self.allocations):
+                f.write(f"frame {i}\n")
+                for where, count, size in frame:
+                    f.write(f"  {count:>7} blocks {size:>10} B  {where}\n")
+                    totals[where][0] += count
+                    totals[where][1] += size
+            f.write("\ntotal over capture\n")
+            for where, (count, size) in sorted(totals.items(), key=lambda item: item[1][1], reverse=True):
+                f.write(f"  {count:>7} blocks {size:>10} B  {where}\n")
+
+        events = list(self.events)
+        pid = os.getpid()
+        for tid, name in self.thread_names.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+        with open(os.path.join(path, "trace.json"), "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+        self.profiler = None
+        return path
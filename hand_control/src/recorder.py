@@ -0,0 +1,159 @@
+import os
+import json
+import time
+import threading
+import collections
+import cv2
+import numpy as np
+
+class ClipRecorder:
+    def __init__(self, output_dir="recordings", seconds=10.0, fps=15.0, width=640, capacity=4, jpeg_quality=80):
+        self.output_dir = output_dir
+        self.seconds = seconds
+        self.fps = fps
+        self.width = width
+        self.capacity = capacity
+        self.jpeg_quality = jpeg_quality
+
+        # The loop only appends references; the encoder thread owns
+        # everything else. A full queue drops the frame instead of waiting.
+        self.queue = collections.deque()
+        self.buffer = collections.deque()
+        self.last_accepted = 0.0
+        self.save_requested = False
+        self.stats = {"pushed": 0, "throttled": 0, "dropped": 0, "encoded": 0, "clips": 0}
+
+        self.wake = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.savers = []
+        self.clip_paths = set()
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="recorder", daemon=True)
+            self.thread.start()
+        return self
+
+    def push(self, frame, seq, timestamp, hands_data, controller_data):
+        # Some slack so a 30 fps camera reliably yields every other frame at 15 fps.
+        if timestamp - self.last_accepted < 0.9 / self.fps:
+            self.stats["throttled"] += 1
+            return False
+        if len(self.queue) >= self.capacity:
+            self.stats["dropped"] += 1
+            return False
+        self.last_accepted = timestamp
+        # Controller results are refilled every frame, so take the few
+        # fields the sidecar needs now rather than on the encoder thread.
+        self.queue.append((frame, seq, timestamp, hands_data, self.describe_state(controller_data)))
+        self.stats["pushed"] += 1
+        self.wake.set()
+        return True
+
+    def request_save(self):
+        self.save_requested = True
+        self.wake.set()
+
+    def describe_state(self, controller_data):
+        data = controller_data or {}
+        screen_pos = data.get("screen_pos")
+        return {
+            "mode": data.get("mode") or "standby",
+            "gesture": data.get("gesture"),
+            "active": (data.get("system") or {}).get("is_active", False),
+            "dragging": data.get("is_dragging", False),
+            "cursor": [round(float(v), 1) for v in screen_pos] if screen_pos else None,
+        }
+
+    def describe_frame(self, seq, timestamp, hands_data, state):
+        return {
+            "seq": seq,
+            "t": timestamp,
+            **state,
+            "hands": [
+                {
+                    "label": hand["label"],
+                    "score": round(float(hand.get("score", 1.0)), 4),
+                    "landmarks": [[round(lm.x, 5), round(lm.y, 5), round(lm.z, 5)] for lm in hand["landmarks"].landmark],
+                }
+                for hand in hands_data
+            ],
+        }
+
+    def encode(self, frame):
+        h, w = frame.shape[:2]
+        if w > self.width:
+            frame = cv2.resize(frame, (self.width, int(h * self.width / w)), interpolation=cv2.INTER_AREA)
+        ok, jpeg = cv2.imencode(".jpg", frame, (cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality))
+        return jpeg.tobytes() if ok else None
+
+    def run(self):
+        while not self.stop_event.is_set():
+            self.wake.wait(0.5)
+            self.wake.clear()
+            while self.queue:
+                frame, seq, timestamp, hands_data, state = self.queue.popleft()
+                jpeg = self.encode(frame)
+                if jpeg is None:
+                    continue
+                self.buffer.append((jpeg, self.describe_frame(seq, timestamp, hands_data, state)))
+                self.stats["encoded"] += 1
+                while self.buffer and timestamp - self.buffer[0][1]["t"] > self.seconds:
+                    self.buffer.popleft()
+            if self.save_requested:
+                self.save_requested = False
+                self.save_snapshot(list(self.buffer))
+
+    def save_snapshot(self, entries):
+        if not entries:
+            print("Clip buffer is empty, nothing to save")
+            return
+        path = self.clip_path()
+        saver = threading.Thread(target=self.write_clip, args=(entries, path), name="recorder-save", daemon=True)
+        saver.start()
+        self.savers.append(saver)
+
+    def clip_path(self):
+        # Saves run on their own threads and may not have created their files
+        # yet, so names handed out earlier count as taken too.
+        now = time.time()
+        base = os.path.join(self.output_dir, time.strftime("clip-%Y%m%d-%H%M%S", time.localtime(now))
+                            + f"-{int(now * 1000) % 1000:03d}")
+        path, n = base, 1
+        while path in self.clip_paths or os.path.exists(path + ".avi") or os.path.exists(path + ".jsonl"):
+            n += 1
+            path = f"{base}-{n}"
+        self.clip_paths.add(path)
+        return path
+
+    def write_clip(self, entries, path):
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            first = cv2.imdecode(np.frombuffer(entries[0][0], dtype=np.uint8), cv2.IMREAD_COLOR)
+            h, w = first.shape[:2]
+            span = entries[-1][1]["t"] - entries[0][1]["t"]
+            fps = (len(entries) - 1) / span if span > 0 else self.fps
+            writer = cv2.VideoWriter(path + ".avi", cv2.VideoWriter_fourcc(*"MJPG"), fps, (w, h))
+            with open(path + ".jsonl", "w", encoding="utf-8") as f:
+                for index, (jpeg, meta) in enumerate(entries):
+                    image = first if index == 0 else cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+                    writer.write(image)
+                    meta = dict(meta, frame=index)
+                    f.write(json.dumps(meta, separators=(",", ":")) + "\n")
+            writer.release()
+            self.stats["clips"] += 1
+            print(f"Saved {len(entries)} frames ({span:.1f}s) to {path}.avi")
+        except (OSError, cv2.error) as e:
+            print(f"Could not save clip: {e}")
+
+    def close(self):
+        if self.thread is None:
+            return
+        self.stop_event.set()
+        self.wake.set()
+        self.thread.join()
+        self.thread = None
+        for saver in self.savers:
+            saver.join()
+        self.savers = []
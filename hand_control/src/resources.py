@@ -0,0 +1,100 @@
+import os
+import threading
+import cv2
+
+ROLES = ("main", "capture", "background")
+
+# Threads other modules start, matched by name. The main loop (inference,
+# controller and HUD) is the "main" role itself.
+THREAD_ROLES = {
+    "camera": "capture",
+    "telemetry": "background",
+    "audio": "background",
+    "recorder": "background",
+    "recorder-save": "background",
+}
+
+def parse_cpus(text):
+    cpus = set()
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        cpus.update(range(int(first), int(last or first) + 1))
+    if not cpus:
+        raise ValueError(f"No CPUs in {text!r}")
+    return cpus
+
+def parse_assignments(items, convert):
+    result = {}
+    for item in items or []:
+        role, sep, value = item.partition("=")
+        if not sep or role not in ROLES:
+            raise ValueError(f"Expected ROLE=VALUE with ROLE one of {', '.join(ROLES)}: {item!r}")
+        result[role] = convert(value)
+    return result
+
+class ResourceManager:
+    def __init__(self, cv_threads=None, affinity=None, nice=None):
+        self.cv_threads = cv_threads
+        self.affinity = affinity or {}
+        self.nice = nice or {}
+        self.assigned = {}
+        self.errors = []
+
+    def enabled(self):
+        return self.cv_threads is not None or bool(self.affinity) or bool(self.nice)
+
+    def start(self):
+        if self.cv_threads is not None:
+            cv2.setNumThreads(self.cv_threads)
+        if (self.affinity or self.nice) and not hasattr(os, "sched_setaffinity"):
+            self.errors.append("pin threads or set per-thread niceness outside Linux")
+            self.affinity, self.nice = {}, {}
+        # Linux threads inherit their creator's CPU mask, so pinning the main
+        # thread before anything else starts also confines OpenCV's and
+        # MediaPipe's worker pools to the main budget.
+        self.assign("main")
+        return self
+
+    def assign(self, role, thread=None):
+        thread = thread or threading.current_thread()
+        tid = thread.native_id
+        if tid is None or tid in self.assigned:
+            return
+        self.assigned[tid] = (thread.name, role)
+        cpus = self.affinity.get(role)
+        if cpus:
+            try:
+                os.sched_setaffinity(tid, cpus)
+            except OSError as e:
+                self.errors.append(f"pin {thread.name} to {sorted(cpus)}: {e}")
+        nice = self.nice.get(role)
+        if nice is not None:
+            # On Linux PRIO_PROCESS with a thread id changes only that thread.
+            try:
+                os.setpriority(os.PRIO_PROCESS, tid, nice)
+            except OSError as e:
+                self.errors.append(f"nice {nice} for {thread.name}: {e}")
+
+    def assign_threads(self):
+        if not (self.affinity or self.nice):
+            return
+        for thread in threading.enumerate():
+            role = THREAD_ROLES.get(thread.name)
+            if role is not None:
+                self.assign(role, thread)
+
+    def summary(self):
+        parts = [f"OpenCV threads {cv2.getNumThreads()}"]
+        for role in ROLES:
+            details = []
+            if role in self.affinity:
+                details.append("cpus " + ",".join(str(c) for c in sorted(self.affinity[role])))
+            if role in self.nice:
+                details.append(f"nice {self.nice[role]}")
+            if details:
+                names = sorted(name for name, r in self.assigned.values() if r == role)
+                parts.append(f"{role} ({', '.join(details)}): {', '.join(names) or 'no threads yet'}")
+        return "; ".join(parts)
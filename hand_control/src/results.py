@@ -0,0 +1,125 @@
+# Per-frame controller results. The controller owns one instance of each and
+# refills it every frame, so consumers that keep a result past the current
+# frame must copy what they need. to_dict() copies one level: nested results
+# become dicts and list/dict fields are shallow-copied.
+class ResultView:
+    __slots__ = ()
+    KEYS = ()
+
+    # Dict-style access for callers written against the old plain dicts.
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.KEYS
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.KEYS else default
+
+    def keys(self):
+        return self.KEYS
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self.KEYS]
+
+    def to_dict(self):
+        data = {}
+        for key, value in self.items():
+            if isinstance(value, ResultView):
+                value = value.to_dict()
+            elif isinstance(value, (list, dict)):
+                value = type(value)(value)
+            data[key] = value
+        return data
+
+class SystemState(ResultView):
+    __slots__ = ("is_active", "state_progress", "state_msg")
+    KEYS = __slots__
+
+    def __init__(self):
+        self.is_active = False
+        self.state_progress = 0.0
+        self.state_msg = ""
+
+class DebugInfo(ResultView):
+    __slots__ = ("dist_idx", "dist_mid", "thresh", "landmarks", "finger_states", "cached_fingers")
+    KEYS = ("dist_idx", "dist_mid", "thresh", "fingers")
+
+    def __init__(self, finger_states):
+        self.finger_states = finger_states
+        self.dist_idx = 0.0
+        self.dist_mid = 0.0
+        self.thresh = 0.0
+        self.landmarks = None
+        self.cached_fingers = None
+
+    def update(self, dist_idx, dist_mid, thresh, landmarks):
+        self.dist_idx = dist_idx
+        self.dist_mid = dist_mid
+        self.thresh = thresh
+        self.landmarks = landmarks
+        self.cached_fingers = None
+
+    # Finger states cost a dozen distance computations, so they are only
+    # worked out when something actually reads them.
+    @property
+    def fingers(self):
+        if self.cached_fingers is None and self.landmarks is not None:
+            self.cached_fingers = self.finger_states(self.landmarks)
+        return self.cached_fingers
+
+class StandbyResult(ResultView):
+    __slots__ = ("system",)
+    KEYS = __slots__
+    mode = None
+    # An active controller with no hand in view still draws the running HUD.
+    hand_pos = None
+    is_dragging = False
+    roi = None
+    debug = None
+
+    def __init__(self, system):
+        self.system = system
+
+class CalibrationResult(ResultView):
+    __slots__ = ("system", "msg", "progress", "step", "hand_pos", "points", "roi_preview", "debug")
+    KEYS = ("mode",) + __slots__
+    mode = "calibration"
+
+    def __init__(self, system, debug):
+        self.system = system
+        self.debug = debug
+        self.msg = ""
+        self.progress = 0.0
+        self.step = -1
+        self.hand_pos = None
+        self.points = []
+        self.roi_preview = None
+
+class RunningResult(ResultView):
+    __slots__ = ("system", "gesture", "screen_pos", "is_dragging", "roi", "hand_pos", "dynamic", "debug")
+    KEYS = ("mode",) + __slots__
+    mode = "running"
+
+    def __init__(self, system, debug):
+        self.system = system
+        self.debug = debug
+        self.gesture = "move"
+        self.screen_pos = None
+        self.is_dragging = False
+        self.roi = None
+        self.hand_pos = None
+        self.dynamic = None
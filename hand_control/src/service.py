@@ -0,0 +1,445 @@
+import os
+import json
+import time
+import signal
+import socket
+import struct
+import selectors
+import collections
+import multiprocessing
+import numpy as np
+from multiprocessing import shared_memory
+from .landmark_bus import attach_shared_memory
+from .landmarks import from_array, NUM_LANDMARKS
+
+DEFAULT_SOCKET_PATH = "/tmp/agamotto-vision.sock"
+MESSAGE_HEADER = struct.Struct("<II")
+
+def encode_message(header, payload=b""):
+    data = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    return MESSAGE_HEADER.pack(len(data), len(payload)) + data + payload
+
+def recv_exact(sock, n):
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("vision service closed the connection")
+        buf += chunk
+    return bytes(buf)
+
+def recv_message(sock):
+    header_len, payload_len = MESSAGE_HEADER.unpack(recv_exact(sock, MESSAGE_HEADER.size))
+    header = json.loads(recv_exact(sock, header_len))
+    payload = recv_exact(sock, payload_len) if payload_len else b""
+    return header, payload
+
+class MessageReader:
+    def __init__(self):
+        self.buf = bytearray()
+
+    def feed(self, data):
+        self.buf += data
+        messages = []
+        while len(self.buf) >= MESSAGE_HEADER.size:
+            header_len, payload_len = MESSAGE_HEADER.unpack_from(self.buf)
+            total = MESSAGE_HEADER.size + header_len + payload_len
+            if len(self.buf) < total:
+                break
+            start = MESSAGE_HEADER.size
+            header = json.loads(bytes(self.buf[start:start + header_len]))
+            payload = bytes(self.buf[start + header_len:total])
+            del self.buf[:total]
+            messages.append((header, payload))
+        return messages
+
+def worker_main(conn):
+    from .vision import VisionTracker
+
+    trackers = {}
+    options = {}
+    frames = {}
+    while True:
+        try:
+            msg = conn.recv()
+        except EOFError:
+            break
+        op = msg[0]
+        if op == "stop":
+            break
+        client_id = msg[1]
+        if op == "drop":
+            tracker = trackers.pop(client_id, None)
+            if tracker is not None:
+                tracker.close()
+            shm = frames.pop(client_id, None)
+            if shm is not None:
+                shm.close()
+            options.pop(client_id, None)
+        elif op == "config":
+            options[client_id] = msg[2]
+            tracker = trackers.pop(client_id, None)
+            if tracker is not None:
+                tracker.close()
+        elif op == "infer":
+            _, client_id, seq, shm_name, shape = msg
+            shm = frames.get(client_id)
+            if shm is None:
+                # Spawned workers share the server's resource tracker, which
+                # already owns the segment, so attach without unregistering.
+                shm = frames[client_id] = shared_memory.SharedMemory(name=shm_name)
+            tracker = trackers.get(client_id)
+            if tracker is None:
+                # One graph per client so MediaPipe keeps tracking each stream.
+                tracker = trackers[client_id] = VisionTracker(**options.get(client_id, {}))
+            start = time.perf_counter()
+            frame = np.ndarray(tuple(shape), dtype=np.uint8, buffer=shm.buf)
+            hands_data = tracker.process(frame)
+            del frame
+            infer_time = time.perf_counter() - start
+            hands = [{"label": h["label"], "score": h.get("score", 1.0)} for h in hands_data]
+            points = np.array(
+                [[(lm.x, lm.y, lm.z) for lm in h["landmarks"].landmark] for h in hands_data],
+                dtype=np.float32
+            )
+            conn.send(("result", client_id, seq, hands, points.tobytes(), infer_time))
+
+    for tracker in trackers.values():
+        tracker.close()
+    for shm in frames.values():
+        shm.close()
+
+class ClientState:
+    def __init__(self, client_id, sock, worker, shm, capacity, options):
+        self.id = client_id
+        self.sock = sock
+        self.reader = None
+        self.worker = worker
+        self.shm = shm
+        self.capacity = capacity
+        self.options = options
+        self.pending = None
+        self.queued = False
+        self.in_flight = None
+        self.served = 0
+        self.latencies = collections.deque(maxlen=512)
+        self.infer_times = collections.deque(maxlen=512)
+
+    def summary(self):
+        lat = np.array(self.latencies) * 1000.0 if self.latencies else np.zeros(1)
+        inf = np.array(self.infer_times) * 1000.0 if self.infer_times else np.zeros(1)
+        return {
+            "client": self.id,
+            "worker": self.worker,
+            "served": self.served,
+            "latency_ms_p50": float(np.percentile(lat, 50)),
+            "latency_ms_p95": float(np.percentile(lat, 95)),
+            "infer_ms_mean": float(inf.mean()),
+        }
+
+class InferenceServer:
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH, workers=2, stats_interval=10.0):
+        self.socket_path = socket_path
+        self.num_workers = workers
+        self.stats_interval = stats_interval
+        self.selector = selectors.DefaultSelector()
+        self.connections = {}
+        self.clients = {}
+        self.next_client_id = 1
+        self.workers = []
+        self.worker_busy = []
+        self.worker_queues = []
+        self.served = 0
+        self.started = time.time()
+        self.window_start = time.time()
+        self.window_served = 0
+        self.running = False
+
+    def start_workers(self):
+        ctx = multiprocessing.get_context("spawn")
+        for _ in range(self.num_workers):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=worker_main, args=(child,), daemon=True)
+            proc.start()
+            child.close()
+            index = len(self.workers)
+            self.workers.append((proc, parent))
+            self.worker_busy.append(False)
+            self.worker_queues.append(collections.deque())
+            self.selector.register(parent, selectors.EVENT_READ, ("worker", index))
+
+    def serve_forever(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(self.socket_path)
+        self.listener.listen(16)
+        self.listener.setblocking(False)
+        self.selector.register(self.listener, selectors.EVENT_READ, ("listen", None))
+        self.start_workers()
+        print(f"Vision service listening on {self.socket_path} with {self.num_workers} workers")
+
+        self.running = True
+        last_report = time.time()
+        try:
+            while self.running:
+                for key, _ in self.selector.select(timeout=0.5):
+                    kind, ref = key.data
+                    if kind == "listen":
+                        self.accept()
+                    elif kind == "client":
+                        self.read_client(ref)
+                    else:
+                        self.read_worker(ref)
+                now = time.time()
+                if self.stats_interval and now - last_report >= self.stats_interval:
+                    self.report()
+                    last_report = now
+        finally:
+            self.shutdown()
+
+    def stop(self):
+        self.running = False
+
+    def accept(self):
+        sock, _ = self.listener.accept()
+        sock.setblocking(True)
+        client_id = self.next_client_id
+        self.next_client_id += 1
+        self.selector.register(sock, selectors.EVENT_READ, ("client", client_id))
+        self.connections[client_id] = (sock, MessageReader())
+
+    def hello(self, client_id, sock, reader, header):
+        width, height = int(header["width"]), int(header["height"])
+        capacity = width * height * 3
+        shm = shared_memory.SharedMemory(name=f"agamotto_frame_{os.getpid()}_{client_id}", create=True, size=capacity)
+        # Sticky assignment: the client's MediaPipe graph lives in one worker.
+        load = [0] * self.num_workers
+        for client in self.clients.values():
+            load[client.worker] += 1
+        worker = load.index(min(load))
+        options = header.get("options") or {}
+        client = ClientState(client_id, sock, worker, shm, capacity, options)
+        client.reader = reader
+        self.clients[client_id] = client
+        self.workers[worker][1].send(("config", client_id, options))
+        sock.sendall(encode_message({"op": "welcome", "client": client_id, "shm": shm.name, "capacity": capacity}))
+        return client
+
+    def read_client(self, client_id):
+        sock, reader = self.connections[client_id]
+        client = self.clients.get(client_id)
+        try:
+            data = sock.recv(65536)
+        except OSError:
+            data = b""
+        if not data:
+            self.drop_client(client_id, sock)
+            return
+        for header, _ in reader.feed(data):
+            op = header.get("op")
+            if op == "hello" and client is None:
+                client = self.hello(client_id, sock, reader, header)
+            elif op == "stats":
+                sock.sendall(encode_message({"op": "stats", **self.stats()}))
+            elif client is None:
+                continue
+            elif op == "infer":
+                shape = header["shape"]
+                if int(np.prod(shape)) > client.capacity:
+                    sock.sendall(encode_message({"op": "error", "seq": header["seq"], "error": "frame larger than buffer"}))
+                    continue
+                # Latest frame wins: a newer request replaces one still waiting.
+                client.pending = (header["seq"], shape, time.perf_counter())
+                if not client.queued:
+                    client.queued = True
+                    self.worker_queues[client.worker].append(client_id)
+                self.dispatch(client.worker)
+            elif op == "config":
+                client.options.update(header.get("options") or {})
+                self.workers[client.worker][1].send(("config", client_id, client.options))
+
+    def dispatch(self, worker):
+        if self.worker_busy[worker]:
+            return
+        queue = self.worker_queues[worker]
+        # Each client has at most one entry in the queue, so popping from the
+        # front serves the clients round-robin.
+        while queue:
+            client = self.clients.get(queue.popleft())
+            if client is None:
+                continue
+            client.queued = False
+            if client.pending is None:
+                continue
+            seq, shape, _ = client.pending
+            client.in_flight = client.pending
+            client.pending = None
+            self.workers[worker][1].send(("infer", client.id, seq, client.shm.name, shape))
+            self.worker_busy[worker] = True
+            return
+
+    def read_worker(self, worker):
+        conn = self.workers[worker][1]
+        try:
+            msg = conn.recv()
+        except EOFError:
+            self.selector.unregister(conn)
+            print(f"Vision worker {worker} exited")
+            return
+        _, client_id, seq, hands, points, infer_time = msg
+        self.worker_busy[worker] = False
+        client = self.clients.get(client_id)
+        if client is not None and client.in_flight is not None and client.in_flight[0] == seq:
+            latency = time.perf_counter() - client.in_flight[2]
+            client.in_flight = None
+            client.served += 1
+            client.latencies.append(latency)
+            client.infer_times.append(infer_time)
+            self.served += 1
+            self.window_served += 1
+            try:
+                client.sock.sendall(encode_message({"op": "result", "seq": seq, "hands": hands}, points))
+            except OSError:
+                self.drop_client(client_id, client.sock)
+        self.dispatch(worker)
+
+    def drop_client(self, client_id, sock):
+        try:
+            self.selector.unregister(sock)
+        except (KeyError, ValueError):
+            pass
+        sock.close()
+        self.connections.pop(client_id, None)
+        client = self.clients.pop(client_id, None)
+        if client is not None:
+            self.workers[client.worker][1].send(("drop", client_id))
+            client.shm.close()
+            client.shm.unlink()
+
+    def stats(self):
+        elapsed = max(1e-6, time.time() - self.started)
+        return {
+            "clients": [c.summary() for c in self.clients.values()],
+            "served": self.served,
+            "throughput_fps": self.served / elapsed,
+        }
+
+    def report(self):
+        now = time.time()
+        rate = self.window_served / max(1e-6, now - self.window_start)
+        self.window_start = now
+        self.window_served = 0
+        print(f"[vision] {len(self.clients)} clients, {rate:.1f} frames/s")
+        for c in self.clients.values():
+            s = c.summary()
+            print(f"  client {s['client']} (worker {s['worker']}): p50 {s['latency_ms_p50']:.1f} ms, "
+                  f"p95 {s['latency_ms_p95']:.1f} ms, inference {s['infer_ms_mean']:.1f} ms")
+
+    def shutdown(self):
+        for client_id, (sock, _) in list(self.connections.items()):
+            self.drop_client(client_id, sock)
+        for proc, conn in self.workers:
+            try:
+                conn.send(("stop",))
+            except OSError:
+                pass
+        for proc, _ in self.workers:
+            proc.join(timeout=2.0)
+        self.listener.close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+class RemoteVisionTracker:
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH, max_hands=2, detection_confidence=0.8,
+                 tracking_confidence=0.8, model_complexity=1):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(socket_path)
+        self.model_complexity = model_complexity
+        self.input_scale = 1.0
+        self.options = {
+            "max_hands": max_hands,
+            "detection_confidence": detection_confidence,
+            "tracking_confidence": tracking_confidence,
+            "model_complexity": model_complexity,
+        }
+        self.client_id = None
+        self.capacity = 0
+        self.shm = None
+        self.seq = 0
+        self.latencies = collections.deque(maxlen=512)
+
+    def register(self, frame):
+        # The shared buffer is sized from the first full-resolution frame.
+        height, width = frame.shape[:2]
+        self.sock.sendall(encode_message({"op": "hello", "width": width, "height": height, "options": self.options}))
+        header, _ = recv_message(self.sock)
+        self.client_id = header["client"]
+        self.capacity = header["capacity"]
+        self.shm = attach_shared_memory(header["shm"])
+
+    def process(self, frame):
+        if self.shm is None:
+            self.register(frame)
+        if self.input_scale < 1.0:
+            import cv2
+            frame = cv2.resize(frame, None, fx=self.input_scale, fy=self.input_scale, interpolation=cv2.INTER_AREA)
+        if frame.nbytes > self.capacity:
+            raise ValueError(f"frame of {frame.nbytes} bytes does not fit the {self.capacity}-byte shared buffer")
+        start = time.perf_counter()
+        target = np.ndarray(frame.shape, dtype=np.uint8, buffer=self.shm.buf)
+        np.copyto(target, frame)
+        del target
+
+        self.seq += 1
+        self.sock.sendall(encode_message({"op": "infer", "seq": self.seq, "shape": list(frame.shape)}))
+        header, payload = recv_message(self.sock)
+        while header.get("seq") != self.seq:
+            header, payload = recv_message(self.sock)
+        self.latencies.append(time.perf_counter() - start)
+        if header["op"] == "error":
+            raise RuntimeError(header["error"])
+
+        points = np.frombuffer(payload, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+        return [
+            {"landmarks": from_array(p), "label": h["label"], "score": h["score"]}
+            for h, p in zip(header["hands"], points)
+        ]
+
+    def set_model_complexity(self, model_complexity):
+        if model_complexity == self.model_complexity:
+            return
+        self.model_complexity = model_complexity
+        self.options["model_complexity"] = model_complexity
+        if self.shm is not None:
+            self.sock.sendall(encode_message({"op": "config", "options": {"model_complexity": model_complexity}}))
+
+    def stats(self):
+        self.sock.sendall(encode_message({"op": "stats"}))
+        header, _ = recv_message(self.sock)
+        while header.get("op") != "stats":
+            header, _ = recv_message(self.sock)
+        return header
+
+    def close(self):
+        self.sock.close()
+        if self.shm is not None:
+            self.shm.close()
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Shared hand-inference service for several camera stations")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Unix socket path to listen on")
+    parser.add_argument("--workers", type=int, default=2, help="number of inference worker processes")
+    parser.add_argument("--stats-interval", type=float, default=10.0, help="seconds between stats reports (0 = off)")
+    args = parser.parse_args(argv)
+
+    server = InferenceServer(args.socket, workers=args.workers, stats_interval=args.stats_interval)
+    signal.signal(signal.SIGTERM, lambda signum, frame: server.stop())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
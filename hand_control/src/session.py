@@ -0,0 +1,127 @@
+import json
+import time
+import bisect
+import cv2
+import numpy as np
+from .landmarks import from_array
+from .source import PacedSource
+
+SESSION_VERSION = 1
+
+class SessionRecorder:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "w", encoding="utf-8", buffering=1 << 16)
+        self.file.write(json.dumps({"type": "session", "version": SESSION_VERSION, "created": time.time()}) + "\n")
+        self.frames = 0
+
+    def record(self, seq, timestamp, hands_data):
+        hands = [
+            {
+                "label": hand["label"],
+                "score": round(float(hand.get("score", 1.0)), 4),
+                "landmarks": [[round(lm.x, 5), round(lm.y, 5), round(lm.z, 5)] for lm in hand["landmarks"].landmark],
+            }
+            for hand in hands_data
+        ]
+        self.file.write(json.dumps({"seq": seq, "t": timestamp, "hands": hands}, separators=(",", ":")) + "\n")
+        self.frames += 1
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+def load_session(path):
+    frames = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if entry.get("type") == "session":
+                if entry.get("version") != SESSION_VERSION:
+                    raise ValueError(f"Unsupported session version in {path}: {entry.get('version')}")
+                continue
+            hands = [
+                {
+                    "landmarks": from_array(np.asarray(hand["landmarks"], dtype=np.float32)),
+                    "label": hand["label"],
+                    "score": hand.get("score", 1.0),
+                }
+                for hand in entry["hands"]
+            ]
+            frames.append((entry["t"], hands))
+    return frames
+
+class SessionSource(PacedSource):
+    # Plays a recorded session back as a paced frame source. Each frame shows
+    # the scripted landmarks as dots, so the motion gate and the HUD see the
+    # hand move, and ReplayTracker hands the landmarks to the controller.
+    def __init__(self, frames, width=640, height=480, fps=30.0, realtime=True, loop=False):
+        super().__init__(fps, realtime, loop)
+        if not frames:
+            raise ValueError("Session has no frames")
+        self.frames = frames
+        self.times = [t - frames[0][0] for t, _ in frames]
+        self.width = width
+        self.height = height
+        self.background = np.full((height, width, 3), 60, dtype=np.uint8)
+        self.current_hands = []
+        self.current_timestamp = None
+
+    def hands_at(self, index):
+        i = bisect.bisect_right(self.times, index / self.fps) - 1
+        return self.frames[max(0, i)][1]
+
+    def render(self, hands):
+        image = self.background.copy()
+        for hand in hands:
+            # main.py mirrors the frame before inference and sessions are
+            # recorded after that, so draw the points mirrored back.
+            for lm in hand["landmarks"].landmark:
+                cv2.circle(image, (int((1.0 - lm.x) * self.width), int(lm.y * self.height)), 4, (255, 255, 255), -1)
+        return image
+
+    def read_frame(self):
+        if self.finished:
+            return None
+        target = self.pace()
+        if target / self.fps > self.times[-1] + 0.5 / self.fps:
+            if not self.loop:
+                self.finished = True
+                return None
+            self.restart()
+            target = self.pace()
+        self.position = target
+        self.current_hands = self.hands_at(target)
+        frame = self.emit(self.render(self.current_hands))
+        self.current_timestamp = frame.timestamp
+        return frame
+
+    def describe(self):
+        mode = "realtime" if self.realtime else "fast"
+        loop = ", looping" if self.loop else ""
+        return f"session:{len(self.frames)} frames, {self.times[-1]:.1f}s @ {self.fps:.0f} fps ({mode}{loop})"
+
+class ReplayTracker:
+    # Stands in for VisionTracker when the source is a SessionSource: returns
+    # the landmarks scripted for the frame the source just emitted, after an
+    # optional delay that models inference cost.
+    def __init__(self, source, inference_ms=0.0):
+        self.source = source
+        self.inference_ms = inference_ms
+        self.model_complexity = 1
+        self.input_scale = 1.0
+
+    def set_model_complexity(self, model_complexity):
+        self.model_complexity = model_complexity
+
+    def process(self, frame):
+        if self.inference_ms > 0:
+            time.sleep(self.inference_ms / 1000.0)
+        return list(self.source.current_hands)
+
+    def close(self):
+        pass
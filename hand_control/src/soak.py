@@ -0,0 +1,157 @@
+import gc
+import os
+import json
+import time
+import threading
+import collections
+import numpy as np
+
+def rss_bytes():
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current outside Linux, still enough to see growth.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+def object_counts():
+    gc.collect()
+    return collections.Counter(type(o).__name__ for o in gc.get_objects())
+
+def percentiles(values):
+    if not values:
+        return None
+    p50, p95, p99 = np.percentile(values, (50, 95, 99))
+    return {"p50": round(float(p50), 3), "p95": round(float(p95), 3), "p99": round(float(p99), 3)}
+
+def rising(series, min_growth, min_ratio=0.0, steady=0.8, min_rises=1):
+    # Leaks climb a little every interval; caches filling up or a busy
+    # stretch go up and come back down.
+    if len(series) < 3:
+        return None
+    growth = series[-1] - series[0]
+    if growth < min_growth or (min_ratio and growth < abs(series[0]) * min_ratio):
+        return None
+    steps = [b - a for a, b in zip(series, series[1:])]
+    if sum(1 for d in steps if d >= 0) / len(steps) < steady or sum(1 for d in steps if d > 0) < min_rises:
+        return None
+    return growth
+
+class SoakMonitor:
+    def __init__(self, path, interval=60.0, warmup=2, top_types=12, rss_growth_mb=32.0, object_growth=2000,
+                 latency_drift=0.25, latency_drift_ms=2.0):
+        self.path = path
+        self.interval = interval
+        # The first samples see caches, pools and lazy imports filling up.
+        self.warmup = warmup
+        self.top_types = top_types
+        self.rss_growth_mb = rss_growth_mb
+        self.object_growth = object_growth
+        self.latency_drift = latency_drift
+        self.latency_drift_ms = latency_drift_ms
+        self.file = open(path, "w", encoding="utf-8", buffering=1)
+        self.started = time.time()
+        self.last_sample = self.started
+        self.frames = 0
+        self.frame_ms = []
+        self.stage_ms = {}
+        self.samples = []
+        self.type_history = {}
+
+    def frame(self, clock):
+        self.frames += 1
+        self.frame_ms.append(clock.frame_time() * 1000.0)
+        for stage, seconds in clock.stages.items():
+            self.stage_ms.setdefault(stage, []).append(seconds * 1000.0)
+        now = time.time()
+        if now - self.last_sample >= self.interval:
+            self.sample(now)
+
+    def sample(self, now=None, partial=False):
+        now = now or time.time()
+        began = time.perf_counter()
+        counts = object_counts()
+        index = len(self.samples)
+        for name, count in counts.items():
+            self.type_history.setdefault(name, [0] * index).append(count)
+        for name, history in self.type_history.items():
+            if len(history) == index:
+                history.append(0)
+        rss = rss_bytes()
+        entry = {
+            "t": round(now - self.started, 1),
+            "frames": self.frames,
+            "rss_mb": round(rss / 2 ** 20, 2) if rss is not None else None,
+            "threads": threading.active_count(),
+            "thread_names": sorted(collections.Counter(t.name for t in threading.enumerate()).items()),
+            "objects": sum(counts.values()),
+            "types": dict(counts.most_common(self.top_types)),
+            "frame_ms": percentiles(self.frame_ms),
+            "stages_p95_ms": {stage: round(float(np.percentile(v, 95)), 3) for stage, v in self.stage_ms.items() if v},
+        }
+        if partial:
+            entry["partial"] = True
+        entry["sample_ms"] = round((time.perf_counter() - began) * 1000.0, 1)
+        self.samples.append(entry)
+        self.file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self.frame_ms = []
+        self.stage_ms = {}
+        self.last_sample = now
+        return entry
+
+    def findings(self):
+        samples = self.samples[self.warmup:]
+        skip = len(self.samples) - len(samples)
+        found = []
+        if len(samples) < 3:
+            return found
+
+        rss = [s["rss_mb"] for s in samples if s["rss_mb"] is not None]
+        growth = rising(rss, self.rss_growth_mb) if len(rss) == len(samples) else None
+        if growth is not None:
+            found.append(f"RSS grew {growth:.1f} MB ({rss[0]:.1f} -> {rss[-1]:.1f} MB)")
+        # The sample close() takes covers a short stretch and can catch a
+        # lazily started or still finishing thread, so it is left out here.
+        full = [s for s in samples if not s.get("partial")]
+        # One extra thread can be a worker started on first use (audio cue,
+        # clip save); a leak keeps adding them interval after interval.
+        growth = rising([s["threads"] for s in full], 2, steady=1.0, min_rises=2)
+        if growth is not None:
+            found.append(f"live threads grew by {growth} ({full[0]['threads']} -> {full[-1]['threads']}): "
+                         + ", ".join(f"{name} x{n}" for name, n in full[-1]["thread_names"]))
+        for name, history in self.type_history.items():
+            growth = rising(history[skip:], self.object_growth, min_ratio=0.1)
+            if growth is not None:
+                found.append(f"{name} objects grew by {growth} ({history[skip]} -> {history[-1]})")
+
+        # Compare the first and last quarter of the run so one slow interval
+        # does not count as drift.
+        quarter = max(1, len(samples) // 4)
+        windows = [s for s in full if s["frame_ms"]]
+        if len(windows) >= 2 * quarter:
+            early = np.mean([s["frame_ms"]["p95"] for s in windows[:quarter]])
+            late = np.mean([s["frame_ms"]["p95"] for s in windows[-quarter:]])
+            if late > early * (1 + self.latency_drift) and late - early > self.latency_drift_ms:
+                stages = []
+                for stage in windows[-1]["stages_p95_ms"]:
+                    before = np.mean([s["stages_p95_ms"].get(stage, 0.0) for s in windows[:quarter]])
+                    after = np.mean([s["stages_p95_ms"].get(stage, 0.0) for s in windows[-quarter:]])
+                    if after - before > self.latency_drift_ms / 2:
+                        stages.append(f"{stage} {before:.1f} -> {after:.1f} ms")
+                found.append(f"p95 frame time drifted {early:.1f} -> {late:.1f} ms"
+                             + (f" ({', '.join(stages)})" if stages else ""))
+        return found
+
+    def close(self):
+        if self.frame_ms:
+            self.sample(partial=True)
+        found = self.findings()
+        self.file.write(json.dumps({"samples": len(self.samples), "warmup": self.warmup, "findings": found}) + "\n")
+        self.file.close()
+        return found
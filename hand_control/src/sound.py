@@ -1,28 +1,257 @@
-import winsound
+import io
+import os
+import sys
+import time
+import wave
+import shutil
 import threading
+import subprocess
+import collections
+import numpy as np
+
+SAMPLE_RATE = 22050
+
+# Each cue is a sequence of (frequency Hz, duration s); frequency 0 is silence.
+CUES = {
+    "active": ((1000, 0.2), (1500, 0.3)),
+    "deactive": ((800, 0.2), (500, 0.3)),
+    "calibration_tick": ((2000, 0.05),),
+    "calibration_done": ((1200, 0.1), (0, 0.03), (1200, 0.1)),
+}
+
+CUE_MIN_INTERVAL = {
+    "calibration_tick": 0.15,
+}
+DEFAULT_MIN_INTERVAL = 0.05
+
+def synthesize_tone(freq, duration, sample_rate=SAMPLE_RATE, volume=0.4):
+    n = int(sample_rate * duration)
+    if freq <= 0:
+        return np.zeros(n, dtype=np.int16)
+    t = np.arange(n, dtype=np.float32) / sample_rate
+    samples = np.sin(2 * np.pi * freq * t) * volume
+    # Short fade in/out so tones do not click.
+    fade = min(n // 2, int(sample_rate * 0.005))
+    if fade > 0:
+        ramp = np.linspace(0.0, 1.0, fade, dtype=np.float32)
+        samples[:fade] *= ramp
+        samples[-fade:] *= ramp[::-1]
+    return (samples * 32767).astype(np.int16)
+
+def to_wav_bytes(samples, sample_rate=SAMPLE_RATE):
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(samples.tobytes())
+    return buf.getvalue()
+
+class ToneBank:
+    def __init__(self, cues=CUES, sample_rate=SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.buffers = {
+            name: np.concatenate([synthesize_tone(f, d, sample_rate) for f, d in tones])
+            for name, tones in cues.items()
+        }
+        self.wav_cache = {}
+
+    def samples(self, name):
+        return self.buffers[name]
+
+    def wav_bytes(self, name):
+        data = self.wav_cache.get(name)
+        if data is None:
+            data = to_wav_bytes(self.buffers[name], self.sample_rate)
+            self.wav_cache[name] = data
+        return data
+
+class NullBackend:
+    def __init__(self):
+        self.played = []
+
+    def play(self, name, bank):
+        self.played.append((time.time(), name))
+
+    def close(self):
+        pass
+
+class WinsoundBackend:
+    def __init__(self):
+        import winsound
+        self.winsound = winsound
+
+    def play(self, name, bank):
+        self.winsound.PlaySound(bank.wav_bytes(name), self.winsound.SND_MEMORY)
+
+    def close(self):
+        pass
+
+class LinuxBackend:
+    def __init__(self, player=None, sample_rate=SAMPLE_RATE):
+        self.player = player or shutil.which("aplay")
+        if self.player is None:
+            raise RuntimeError("aplay not found")
+        self.sample_rate = sample_rate
+        self.proc = None
+
+    def open(self):
+        # One long-lived aplay reading raw PCM from stdin, so a cue costs a
+        # pipe write instead of a process start.
+        self.proc = subprocess.Popen(
+            [self.player, "-q", "-t", "raw", "-f", "S16_LE", "-c", "1", "-r", str(self.sample_rate)],
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+    def play(self, name, bank):
+        if self.proc is None or self.proc.poll() is not None:
+            self.open()
+        try:
+            self.proc.stdin.write(bank.samples(name).tobytes())
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            self.proc = None
+
+    def close(self):
+        if self.proc is not None:
+            try:
+                self.proc.stdin.close()
+            except OSError:
+                pass
+            self.proc.terminate()
+            self.proc = None
+
+class WavFileBackend:
+    def __init__(self, path, sample_rate=SAMPLE_RATE, gap=0.1):
+        self.path = path
+        self.writer = wave.open(path, "wb")
+        self.writer.setnchannels(1)
+        self.writer.setsampwidth(2)
+        self.writer.setframerate(sample_rate)
+        self.gap = np.zeros(int(sample_rate * gap), dtype=np.int16).tobytes()
+        self.played = []
+
+    def play(self, name, bank):
+        self.writer.writeframes(bank.samples(name).tobytes() + self.gap)
+        self.played.append((time.time(), name))
+
+    def close(self):
+        self.writer.close()
+
+def create_backend(spec=None):
+    spec = spec or os.environ.get("AGAMOTTO_AUDIO", "auto")
+    if spec == "null":
+        return NullBackend()
+    if spec.startswith("wav:"):
+        return WavFileBackend(spec[4:])
+    if spec == "winsound" or (spec == "auto" and sys.platform == "win32"):
+        return WinsoundBackend()
+    if spec == "linux" or (spec == "auto" and shutil.which("aplay")):
+        return LinuxBackend()
+    return NullBackend()
+
+class AudioWorker:
+    def __init__(self, backend, bank=None, max_pending=4):
+        self.backend = backend
+        self.bank = bank or ToneBank()
+        self.max_pending = max_pending
+        self.pending = collections.deque()
+        self.last_submitted = {}
+        self.cond = threading.Condition()
+        self.stopped = False
+        self.thread = None
+        self.stats = {"played": 0, "deduplicated": 0, "rate_limited": 0, "dropped": 0, "errors": 0}
+
+    def submit(self, name):
+        now = time.time()
+        with self.cond:
+            if self.stopped:
+                return False
+            if name in self.pending:
+                self.stats["deduplicated"] += 1
+                return False
+            min_interval = CUE_MIN_INTERVAL.get(name, DEFAULT_MIN_INTERVAL)
+            if now - self.last_submitted.get(name, 0) < min_interval:
+                self.stats["rate_limited"] += 1
+                return False
+            if len(self.pending) >= self.max_pending:
+                self.stats["dropped"] += 1
+                return False
+            self.pending.append(name)
+            self.last_submitted[name] = now
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="audio", daemon=True)
+                self.thread.start()
+            self.cond.notify()
+        return True
+
+    def run(self):
+        while True:
+            with self.cond:
+                while not self.pending and not self.stopped:
+                    self.cond.wait()
+                if not self.pending:
+                    break
+                name = self.pending.popleft()
+            try:
+                self.backend.play(name, self.bank)
+                self.stats["played"] += 1
+            except Exception:
+                self.stats["errors"] += 1
+
+    def stop(self, timeout=2.0):
+        with self.cond:
+            self.stopped = True
+            self.cond.notify()
+        if self.thread is not None:
+            self.thread.join(timeout)
+        self.backend.close()
 
 class SoundManager:
+    _worker = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, backend=None):
+        if isinstance(backend, str) or backend is None:
+            backend = create_backend(backend)
+        with cls._lock:
+            old, cls._worker = cls._worker, AudioWorker(backend)
+        if old is not None:
+            old.stop()
+        return cls._worker
+
+    @classmethod
+    def worker(cls):
+        if cls._worker is None:
+            with cls._lock:
+                if cls._worker is None:
+                    cls._worker = AudioWorker(create_backend())
+        return cls._worker
+
+    @classmethod
+    def shutdown(cls):
+        with cls._lock:
+            worker, cls._worker = cls._worker, None
+        if worker is not None:
+            worker.stop()
+
+    @classmethod
+    def play(cls, name):
+        return cls.worker().submit(name)
+
     @staticmethod
     def play_active():
-        def _play():
-            winsound.Beep(1000, 200) 
-            winsound.Beep(1500, 300) 
-        threading.Thread(target=_play, daemon=True).start()
+        SoundManager.play("active")
 
     @staticmethod
     def play_deactive():
-        def _play():
-            winsound.Beep(800, 200) 
-            winsound.Beep(500, 300) 
-        threading.Thread(target=_play, daemon=True).start()
+        SoundManager.play("deactive")
 
     @staticmethod
     def play_calibration_tick():
-         threading.Thread(target=lambda: winsound.Beep(2000, 50), daemon=True).start()
+        SoundManager.play("calibration_tick")
 
     @staticmethod
     def play_calibration_done():
-        def _play():
-            winsound.Beep(1200, 100)
-            winsound.Beep(1200, 100)
-        threading.Thread(target=_play, daemon=True).start()
+        SoundManager.play("calibration_done")
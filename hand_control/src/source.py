@@ -0,0 +1,237 @@
+import os
+import time
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+class Frame:
+    def __init__(self, image, seq, timestamp):
+        self.image = image
+        self.seq = seq
+        self.timestamp = timestamp
+
+class FrameSource:
+    tracer = None
+
+    def start(self):
+        return self
+
+    def read_frame(self):
+        raise NotImplementedError
+
+    def read(self):
+        frame = self.read_frame()
+        if frame is None:
+            return False, None
+        return True, frame.image
+
+    def isOpened(self):
+        return False
+
+    def release(self):
+        pass
+
+    def describe(self):
+        return self.__class__.__name__
+
+class PacedSource(FrameSource):
+    def __init__(self, fps=30.0, realtime=True, loop=False):
+        self.fps = float(fps) if fps and fps > 0 else 30.0
+        self.realtime = realtime
+        self.loop = loop
+        self.seq = 0
+        self.position = 0
+        self.start_time = None
+        self.finished = False
+
+    def pace(self):
+        # Returns the file/pattern index that is due now. Frames the consumer
+        # was too slow for are skipped, the same way a live camera drops them.
+        if not self.realtime:
+            return self.position
+        now = time.time()
+        if self.start_time is None:
+            self.start_time = now - self.position / self.fps
+        due = self.start_time + self.position / self.fps
+        if now < due:
+            time.sleep(due - now)
+            return self.position
+        return max(self.position, int((now - self.start_time) * self.fps))
+
+    def restart(self):
+        self.position = 0
+        self.start_time = None
+
+    def emit(self, image):
+        # In realtime mode a frame is stamped with the moment it was due, the
+        # way a camera stamps exposure, so a slow consumer shows up as latency.
+        timestamp = self.start_time + self.position / self.fps if self.realtime else time.time()
+        self.seq += 1
+        self.position += 1
+        return Frame(image, self.seq, timestamp)
+
+    def isOpened(self):
+        return not self.finished
+
+    def release(self):
+        self.finished = True
+
+class VideoFileSource(PacedSource):
+    def __init__(self, path, realtime=True, loop=False, fps=None):
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        native_fps = self.cap.get(cv2.CAP_PROP_FPS)
+        super().__init__(fps or native_fps, realtime, loop)
+        self.finished = not self.cap.isOpened()
+
+    def read_frame(self):
+        if self.finished:
+            return None
+        target = self.pace()
+        while self.position < target:
+            if not self.cap.grab():
+                break
+            self.position += 1
+        grabbed, image = self.cap.read()
+        if not grabbed:
+            if self.loop and self.position > 0:
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                self.restart()
+                return self.read_frame()
+            self.finished = True
+            return None
+        return self.emit(image)
+
+    def release(self):
+        self.finished = True
+        self.cap.release()
+
+    def describe(self):
+        mode = "realtime" if self.realtime else "fast"
+        return f"video:{self.path} ({self.fps:.0f} fps, {mode})"
+
+class ImageFolderSource(PacedSource):
+    def __init__(self, path, fps=30.0, realtime=True, loop=False, preload=False):
+        super().__init__(fps, realtime, loop)
+        self.path = path
+        self.files = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.cache = [cv2.imread(f) for f in self.files] if preload else None
+        self.finished = not self.files
+
+    def read_frame(self):
+        if self.finished:
+            return None
+        target = self.pace()
+        # Unreadable files are skipped; one pass over the folder bounds the
+        # search so a folder with nothing decodable ends instead of spinning.
+        for _ in range(len(self.files)):
+            if target >= len(self.files):
+                if not self.loop:
+                    self.finished = True
+                    return None
+                self.restart()
+                target = self.pace()
+            self.position = target
+            image = self.cache[target] if self.cache is not None else cv2.imread(self.files[target])
+            if image is not None:
+                return self.emit(image)
+            target += 1
+        self.finished = True
+        return None
+
+    def describe(self):
+        mode = "realtime" if self.realtime else "fast"
+        return f"images:{self.path} ({len(self.files)} frames, {self.fps:.0f} fps, {mode})"
+
+class SyntheticSource(PacedSource):
+    PATTERNS = ("bars", "ball", "static")
+
+    def __init__(self, width=640, height=480, fps=30.0, realtime=True, pattern="bars", frames=0):
+        if pattern not in self.PATTERNS:
+            raise ValueError(f"Unknown synthetic pattern: {pattern}")
+        super().__init__(fps, realtime, loop=False)
+        self.width = width
+        self.height = height
+        self.pattern = pattern
+        self.frames = frames
+        self.background = self.build_background(width, height)
+
+    def build_background(self, width, height):
+        bars = np.array([
+            (192, 192, 192), (0, 192, 192), (192, 192, 0), (0, 192, 0),
+            (192, 0, 192), (0, 0, 192), (192, 0, 0), (16, 16, 16)
+        ], dtype=np.uint8)
+        columns = bars[(np.arange(width) * len(bars)) // width]
+        image = np.repeat(columns[np.newaxis, :, :], height, axis=0)
+        image[height * 3 // 4:, :] = np.linspace(0, 255, width, dtype=np.uint8)[:, np.newaxis]
+        return image
+
+    def render(self, index):
+        if self.pattern == "static":
+            return self.background.copy()
+        t = index / self.fps
+        if self.pattern == "bars":
+            shift = int(t * self.width / 4) % self.width
+            image = np.roll(self.background, shift, axis=1)
+        else:
+            image = self.background.copy()
+        radius = max(8, self.height // 12)
+        cx = int((0.5 + 0.4 * np.sin(t * 1.3)) * self.width)
+        cy = int((0.5 + 0.4 * np.sin(t * 2.1)) * self.height)
+        cv2.circle(image, (cx, cy), radius, (255, 255, 255), -1)
+        cv2.putText(image, str(index), (10, self.height - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2)
+        return image
+
+    def read_frame(self):
+        if self.finished:
+            return None
+        target = self.pace()
+        if self.frames and target >= self.frames:
+            self.finished = True
+            return None
+        self.position = target
+        return self.emit(self.render(target))
+
+    def describe(self):
+        mode = "realtime" if self.realtime else "fast"
+        return f"synthetic:{self.width}x{self.height}@{self.fps:.0f}:{self.pattern} ({mode})"
+
+def parse_synthetic_spec(value, width, height, fps):
+    pattern = "bars"
+    for part in value.split(":") if value else []:
+        if part in SyntheticSource.PATTERNS:
+            pattern = part
+            continue
+        size, _, rate = part.partition("@")
+        if size:
+            w, _, h = size.lower().partition("x")
+            width, height = int(w), int(h)
+        if rate:
+            fps = float(rate)
+    return width, height, fps, pattern
+
+def open_source(spec, width=640, height=480, fps=None, realtime=True, loop=False):
+    from .camera import ThreadedCamera
+
+    kind, _, value = str(spec).partition(":")
+    if kind not in ("synthetic", "camera", "video", "images", "session"):
+        kind, value = "", str(spec)
+
+    if kind == "camera" or (not kind and value.isdigit()):
+        return ThreadedCamera(int(value or 0), width=width, height=height)
+    if kind == "session":
+        from .session import SessionSource, load_session
+        return SessionSource(load_session(value), width=width, height=height, fps=fps or 30.0,
+                             realtime=realtime, loop=loop)
+    if kind == "synthetic":
+        w, h, rate, pattern = parse_synthetic_spec(value, width, height, fps or 30.0)
+        return SyntheticSource(w, h, rate, realtime=realtime, pattern=pattern)
+    if kind == "images" or (not kind and os.path.isdir(value)):
+        return ImageFolderSource(value, fps=fps or 30.0, realtime=realtime, loop=loop)
+    if kind == "video" or (not kind and os.path.isfile(value)):
+        return VideoFileSource(value, realtime=realtime, loop=loop, fps=fps)
+    raise ValueError(f"Unrecognised frame source: {spec}")
@@ -0,0 +1,87 @@
+import json
+import os
+import time
+
+DEFAULT_PROFILE_PATH = os.path.join(os.path.expanduser("~"), ".agamotto", "profile.json")
+PROFILE_VERSION = 1
+
+class StationProfile:
+    def __init__(self, path=DEFAULT_PROFILE_PATH):
+        self.path = path
+        self.camera = None
+        self.resolution = None
+        self.controller = None
+        self.startup = {}
+
+    @classmethod
+    def load(cls, path=DEFAULT_PROFILE_PATH):
+        profile = cls(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return profile
+        if data.get("version") != PROFILE_VERSION:
+            return profile
+        profile.camera = data.get("camera")
+        profile.resolution = data.get("resolution")
+        profile.controller = data.get("controller")
+        profile.startup = data.get("startup") or {}
+        return profile
+
+    def save(self):
+        data = {
+            "version": PROFILE_VERSION,
+            "updated": time.time(),
+            "camera": self.camera,
+            "resolution": self.resolution,
+            "controller": self.controller,
+            "startup": self.startup,
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def has_camera(self):
+        return bool(self.camera) and self.camera.get("index") is not None
+
+    def is_calibrated(self):
+        return bool(self.controller) and bool(self.controller.get("roi"))
+
+    def remember_camera(self, identity, width, height):
+        self.camera = identity
+        self.resolution = [int(width), int(height)]
+
+    def camera_mode(self):
+        return self.camera.get("mode") if self.camera else None
+
+    def remember_camera_mode(self, mode):
+        if self.camera is not None:
+            self.camera["mode"] = mode
+
+    def remember_controller(self, mouse):
+        settings = mouse.export_settings()
+        if settings.get("roi") is None and self.controller:
+            settings["roi"] = self.controller.get("roi")
+            settings["roi_source"] = self.controller.get("roi_source")
+        self.controller = settings
+
+    def apply_controller(self, mouse):
+        if self.controller:
+            mouse.apply_settings(self.controller)
+
+    def record_startup(self, path_name, seconds):
+        self.startup[path_name] = round(seconds, 3)
+
+    def startup_summary(self, path_name, seconds):
+        other = "interactive" if path_name == "fast" else "fast"
+        msg = f"Startup ({path_name} path): {seconds:.2f}s"
+        if other in self.startup:
+            msg += f" | last {other} path: {self.startup[other]:.2f}s"
+            if path_name == "fast":
+                msg += f" | saved {self.startup[other] - seconds:.2f}s"
+        return msg
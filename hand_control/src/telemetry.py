@@ -0,0 +1,123 @@
+import json
+import time
+import threading
+import collections
+
+TRACKING = "tracking"
+GESTURE = "gesture"
+CLICK = "click"
+DRAG = "drag"
+SCROLL = "scroll"
+STATE = "state"
+CALIBRATION = "calibration"
+PERFORMANCE = "performance"
+
+EVENT_CATEGORIES = (TRACKING, GESTURE, CLICK, DRAG, SCROLL, STATE, CALIBRATION, PERFORMANCE)
+
+DEFAULT_RATE_LIMITS = {
+    TRACKING: 30.0,
+    SCROLL: 10.0,
+}
+
+class NullEventLogger:
+    enabled = False
+
+    def log(self, category, event, **fields):
+        return False
+
+    def start(self):
+        return self
+
+    def close(self):
+        pass
+
+class EventLogger:
+    enabled = True
+
+    def __init__(self, path, sampling=None, rate_limits=None, capacity=8192, flush_interval=0.25, batch_size=512):
+        self.path = path
+        self.sampling = dict(sampling or {})
+        self.rate_limits = dict(DEFAULT_RATE_LIMITS if rate_limits is None else rate_limits)
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        # deque.append/popleft are atomic, so producers never take a lock;
+        # only the writer thread ever pops.
+        self.queue = collections.deque()
+        self.seen = {}
+        self.buckets = {}
+        self.stats = {"logged": 0, "written": 0, "sampled_out": 0, "rate_limited": 0, "dropped": 0}
+
+        self.file = None
+        self.thread = None
+        self.stop_event = threading.Event()
+
+    def start(self):
+        if self.thread is not None:
+            return self
+        self.file = open(self.path, "a", encoding="utf-8")
+        self.thread = threading.Thread(target=self.run, name="telemetry", daemon=True)
+        self.thread.start()
+        return self
+
+    def allow(self, category, now):
+        every = self.sampling.get(category)
+        if every and every > 1:
+            count = self.seen.get(category, 0) + 1
+            self.seen[category] = count
+            if count % every:
+                self.stats["sampled_out"] += 1
+                return False
+
+        limit = self.rate_limits.get(category)
+        if limit:
+            tokens, last = self.buckets.get(category, (limit, now))
+            tokens = min(limit, tokens + (now - last) * limit)
+            if tokens < 1.0:
+                self.buckets[category] = (tokens, now)
+                self.stats["rate_limited"] += 1
+                return False
+            self.buckets[category] = (tokens - 1.0, now)
+        return True
+
+    def log(self, category, event, **fields):
+        now = time.time()
+        if not self.allow(category, now):
+            return False
+        if len(self.queue) >= self.capacity:
+            self.stats["dropped"] += 1
+            return False
+        self.queue.append((now, category, event, fields))
+        self.stats["logged"] += 1
+        return True
+
+    def drain(self):
+        lines = []
+        queue = self.queue
+        while queue and len(lines) < self.batch_size:
+            t, category, event, fields = queue.popleft()
+            record = {"t": round(t, 6), "cat": category, "ev": event}
+            record.update(fields)
+            lines.append(json.dumps(record, separators=(",", ":"), default=str))
+        if lines:
+            self.file.write("\n".join(lines) + "\n")
+            self.stats["written"] += len(lines)
+        return len(lines)
+
+    def run(self):
+        while not self.stop_event.wait(self.flush_interval):
+            while self.drain() >= self.batch_size:
+                pass
+            self.file.flush()
+
+    def close(self):
+        if self.thread is None:
+            return
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+        self.log(PERFORMANCE, "telemetry_summary", **self.stats)
+        while self.drain():
+            pass
+        self.file.close()
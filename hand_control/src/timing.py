@@ -0,0 +1,24 @@
+import time
+
+class StageClock:
+    def __init__(self):
+        self.stages = {}
+        self.frame_start = 0.0
+        self.last = 0.0
+        self.tracer = None
+
+    def begin_frame(self):
+        self.frame_start = self.last = time.perf_counter()
+        self.stages.clear()
+        return self.frame_start
+
+    def mark(self, name):
+        now = time.perf_counter()
+        if self.tracer is not None:
+            self.tracer.span(name, self.last, now)
+        self.stages[name] = self.stages.get(name, 0.0) + (now - self.last)
+        self.last = now
+        return now
+
+    def frame_time(self):
+        return self.last - self.frame_start
@@ -12,6 +12,8 @@ COLOR_BLACK = (0, 0, 0)
 class HUD:
     def __init__(self):
         self.font = cv2.FONT_HERSHEY_SIMPLEX
+        self.show_extras = True
+        self.camera_mode = None
 
     def draw_text_centered(self, img, text, y, scale=1.0, color=COLOR_WHITE, thickness=2):
         h, w = img.shape[:2]
@@ -114,12 +116,15 @@ class HUD:
     def draw_standby(self, img, system_info):
         try:
             h, w = img.shape[:2]
-            overlay = img.copy()
-            cv2.rectangle(overlay, (0, 0), (w, h), (10, 10, 10), -1)
-            cv2.addWeighted(overlay, 0.9, img, 0.1, 0, img)
+            if self.show_extras:
+                overlay = img.copy()
+                cv2.rectangle(overlay, (0, 0), (w, h), (10, 10, 10), -1)
+                cv2.addWeighted(overlay, 0.9, img, 0.1, 0, img)
+            else:
+                cv2.convertScaleAbs(img, img, 0.1, 9)
             
-            progress = system_info.get("state_progress", 0)
-            msg = system_info.get("state_msg") or ""
+            progress = system_info.state_progress
+            msg = system_info.state_msg or ""
             
             phase = 0
             if "CROSS" in msg: phase = 1
@@ -128,7 +133,10 @@ class HUD:
             center = (w//2, h//2)
             radius = 100
             
-            self.draw_agamotto_eye(img, center, radius, progress, phase=phase)
+            if self.show_extras:
+                self.draw_agamotto_eye(img, center, radius, progress, phase=phase)
+            else:
+                self.draw_progress_circle(img, center, radius, progress, COLOR_GREEN if phase == 2 else COLOR_CYAN)
             
             if phase == 0:
                 self.draw_text_centered(img, "PHASE 1: THE SEAL", h//2 + 150, 0.7, COLOR_CYAN, 1)
@@ -143,20 +151,20 @@ class HUD:
 
     def draw_calibration(self, img, data):
         h, w = img.shape[:2]
-        msg = data["msg"]
-        progress = data.get("progress", 0)
+        msg = data.msg
+        progress = data.progress
         
-        if data.get("hand_pos"):
-            self.draw_crosshair(img, data["hand_pos"])
+        if data.hand_pos:
+            self.draw_crosshair(img, data.hand_pos)
             if progress and progress > 0:
-                cx = int(data["hand_pos"][0] * w)
-                cy = int(data["hand_pos"][1] * h)
+                cx = int(data.hand_pos[0] * w)
+                cy = int(data.hand_pos[1] * h)
                 
                 is_cooldown = "SUCCESS" in str(msg)
                 color = COLOR_RED if is_cooldown else COLOR_CYAN
                 self.draw_progress_circle(img, (cx, cy), 35, progress, color)
         
-        points = data.get("points") or []
+        points = data.points or []
         for i, (px, py) in enumerate(points):
             x = int(px * w)
             y = int(py * h)
@@ -164,7 +172,7 @@ class HUD:
             cv2.circle(img, (x, y), 3, COLOR_CYAN, -1)
             cv2.putText(img, str(i + 1), (x + 14, y - 8), self.font, 0.6, COLOR_WHITE, 2)
         
-        roi = data.get("roi_preview")
+        roi = data.roi_preview
         if roi:
             px1, py1 = int(roi["x1"] * w), int(roi["y1"] * h)
             px2, py2 = int(roi["x2"] * w), int(roi["y2"] * h)
@@ -195,30 +203,32 @@ class HUD:
     def draw_running(self, img, data, fps):
         h, w = img.shape[:2]
         
-        if data.get("hand_pos"):
-            self.draw_crosshair(img, data["hand_pos"])
+        if data.hand_pos:
+            self.draw_crosshair(img, data.hand_pos)
 
         self.draw_overlay_box(img, 0, 0, w, 40, 0.4)
         cv2.putText(img, f"FPS: {int(fps)}", (20, 28), self.font, 0.6, COLOR_CYAN, 2)
+        if self.camera_mode:
+            cv2.putText(img, self.camera_mode, (120, 27), self.font, 0.5, COLOR_WHITE, 1)
         
         status = "ACTIVE"
         color = COLOR_GREEN
-        if data.get("is_dragging"):
+        if data.is_dragging:
             status = "DRAGGING"
             color = COLOR_RED
             
         cv2.putText(img, f"MODE: {status}", (w - 180, 28), self.font, 0.6, color, 2)
         
-        debug = data.get("debug")
+        debug = data.debug
         if debug:
-            dist_idx = float(debug.get("dist_idx", 0.0))
-            dist_mid = float(debug.get("dist_mid", 0.0))
-            thresh = float(debug.get("thresh", 0.0))
+            dist_idx = float(debug.dist_idx)
+            dist_mid = float(debug.dist_mid)
+            thresh = float(debug.thresh)
             cv2.putText(img, f"IDX: {dist_idx:.2f} < {thresh:.2f}", (20, 70), self.font, 0.55, COLOR_WHITE, 2)
             cv2.putText(img, f"MID: {dist_mid:.2f} < 0.20", (20, 95), self.font, 0.55, COLOR_WHITE, 2)
         
-        if data.get("roi"):
-            x1, y1, x2, y2 = data["roi"]["x1"], data["roi"]["y1"], data["roi"]["x2"], data["roi"]["y2"]
+        if data.roi:
+            x1, y1, x2, y2 = data.roi["x1"], data.roi["y1"], data.roi["x2"], data.roi["y2"]
             px1, py1 = int(x1 * w), int(y1 * h)
             px2, py2 = int(x2 * w), int(y2 * h)
             
@@ -237,9 +247,9 @@ class HUD:
 
     def draw_system_overlay(self, img, system_info):
         h, w = img.shape[:2]
-        progress = system_info.get("state_progress", 0)
-        msg = system_info.get("state_msg", "")
+        progress = system_info.state_progress
+        msg = system_info.state_msg
         
-        if progress > 0 and system_info.get("is_active"):
+        if progress > 0 and system_info.is_active:
             self.draw_progress_circle(img, (w//2, h//2), 100, progress, COLOR_RED)
             self.draw_text_centered(img, msg, h//2 + 140, 0.8, COLOR_RED, 2)
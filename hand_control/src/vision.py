@@ -3,19 +3,39 @@ import mediapipe as mp
 import numpy as np
 
 class VisionTracker:
-    def __init__(self, max_hands=2, detection_confidence=0.8, tracking_confidence=0.8):
+    def __init__(self, max_hands=2, detection_confidence=0.8, tracking_confidence=0.8, model_complexity=1):
         self.mp_hands = mp.solutions.hands
+        self.max_hands = max_hands
+        self.detection_confidence = detection_confidence
+        self.tracking_confidence = tracking_confidence
+        self.model_complexity = model_complexity
+        self.input_scale = 1.0
         
-        self.hands = self.mp_hands.Hands(
-            max_num_hands=max_hands,
-            min_detection_confidence=detection_confidence,
-            min_tracking_confidence=tracking_confidence,
-            model_complexity=1
+        self.hands = self.create_hands()
+
+    def create_hands(self):
+        return self.mp_hands.Hands(
+            max_num_hands=self.max_hands,
+            min_detection_confidence=self.detection_confidence,
+            min_tracking_confidence=self.tracking_confidence,
+            model_complexity=self.model_complexity
         )
+
+    def set_model_complexity(self, model_complexity):
+        if model_complexity == self.model_complexity:
+            return
+        self.hands.close()
+        self.model_complexity = model_complexity
+        self.hands = self.create_hands()
         
     def process(self, frame):
         frame.flags.writeable = False
-        image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if self.input_scale < 1.0:
+            # Landmarks are normalised, so a smaller input needs no rescaling afterwards.
+            small = cv2.resize(frame, None, fx=self.input_scale, fy=self.input_scale, interpolation=cv2.INTER_AREA)
+            image = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+        else:
+            image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         
         results = self.hands.process(image)
         
@@ -28,10 +48,130 @@ class VisionTracker:
                 label = handedness.classification[0].label
                 hands_data.append({
                     "landmarks": hand_landmarks,
-                    "label": label
+                    "label": label,
+                    "score": handedness.classification[0].score
                 })
         
         return hands_data
 
     def close(self):
         self.hands.close()
+
+class HybridTracker(VisionTracker):
+    def __init__(self, min_interval=1, max_interval=4, flow_scale=0.5, fb_threshold=1.0,
+                 min_valid_fraction=0.6, min_score=0.85, fast_speed=0.02, slow_speed=0.004, **kwargs):
+        super().__init__(**kwargs)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.flow_scale = flow_scale
+        self.fb_threshold = fb_threshold
+        self.min_valid_fraction = min_valid_fraction
+        self.min_score = min_score
+        self.fast_speed = fast_speed
+        self.slow_speed = slow_speed
+        self.lk_params = dict(
+            winSize=(15, 15),
+            maxLevel=2,
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03)
+        )
+
+        self.prev_gray = None
+        self.last_hands = []
+        self.last_points = None
+        # Points from the last real inference; last_points follows the flow.
+        self.inferred_points = None
+        self.frames_since_inference = 0
+        self.interval = min_interval
+        self.speed = 0.0
+        self.stats = {"inference": 0, "propagated": 0, "rejected": 0}
+
+    def to_gray(self, frame):
+        small = cv2.resize(frame, None, fx=self.flow_scale, fy=self.flow_scale, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    def landmark_points(self, hands_data):
+        if not hands_data:
+            return None
+        return np.array(
+            [[(lm.x, lm.y) for lm in hand["landmarks"].landmark] for hand in hands_data],
+            dtype=np.float32
+        )
+
+    def process(self, frame):
+        gray = self.to_gray(frame)
+        self.frames_since_inference += 1
+
+        hands_data = None
+        if self.last_hands and self.prev_gray is not None and self.frames_since_inference < self.interval:
+            hands_data = self.propagate(self.prev_gray, gray)
+            if hands_data is None:
+                self.stats["rejected"] += 1
+
+        if hands_data is None:
+            hands_data = super().process(frame)
+            points = self.landmark_points(hands_data)
+            if points is not None and self.inferred_points is not None and points.shape == self.inferred_points.shape:
+                moved = np.linalg.norm(points - self.inferred_points, axis=2)
+                self.update_interval(float(np.median(moved)) / max(1, self.frames_since_inference))
+            else:
+                self.interval = self.min_interval
+            if any(hand.get("score", 1.0) < self.min_score for hand in hands_data):
+                self.interval = self.min_interval
+            self.last_points = points
+            self.inferred_points = points
+            self.frames_since_inference = 0
+            self.stats["inference"] += 1
+        else:
+            self.stats["propagated"] += 1
+
+        self.prev_gray = gray
+        self.last_hands = hands_data
+        return hands_data
+
+    def propagate(self, prev_gray, gray):
+        h, w = gray.shape[:2]
+        size = np.array([w, h], dtype=np.float32)
+        start = self.last_points.reshape(-1, 1, 2) * size
+
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(prev_gray, gray, start, None, **self.lk_params)
+        back, back_status, _ = cv2.calcOpticalFlowPyrLK(gray, prev_gray, moved, None, **self.lk_params)
+        fb_error = np.linalg.norm((start - back).reshape(-1, 2), axis=1)
+        valid = (status.ravel() == 1) & (back_status.ravel() == 1) & (fb_error < self.fb_threshold)
+
+        n_hands = len(self.last_hands)
+        valid = valid.reshape(n_hands, -1)
+        displacement = ((moved - start).reshape(n_hands, -1, 2)) / size
+        new_points = self.last_points.copy()
+        speeds = []
+
+        for i in range(n_hands):
+            if valid[i].mean() < self.min_valid_fraction:
+                return None
+            # Points that failed the forward-backward check follow the rest of the hand.
+            shift = np.median(displacement[i][valid[i]], axis=0)
+            hand_shift = np.where(valid[i][:, np.newaxis], displacement[i], shift)
+            new_points[i] += hand_shift
+            speeds.append(float(np.linalg.norm(shift)))
+
+        hands_data = []
+        for hand, points in zip(self.last_hands, new_points):
+            landmarks = type(hand["landmarks"])()
+            landmarks.CopyFrom(hand["landmarks"])
+            for lm, (x, y) in zip(landmarks.landmark, points):
+                lm.x = float(x)
+                lm.y = float(y)
+            hands_data.append({"landmarks": landmarks, "label": hand["label"], "score": hand.get("score", 1.0)})
+
+        self.last_points = new_points
+        self.update_interval(max(speeds))
+        return hands_data
+
+    def update_interval(self, speed):
+        self.speed = speed
+        if speed >= self.fast_speed:
+            self.interval = self.min_interval
+        elif speed <= self.slow_speed:
+            self.interval = self.max_interval
+        else:
+            t = (self.fast_speed - speed) / (self.fast_speed - self.slow_speed)
+            self.interval = int(round(self.min_interval + t * (self.max_interval - self.min_interval)))